@@ -4,38 +4,58 @@
 # Licensed under the GNU General Public License v3.0 (GPL-3.0)
 #
 # File: __init__.py
-# Description: Imports various graph creator classes for the Shake&Tune package.
+# Description: Lazily exposes the various graph creator classes for the Shake&Tune package.
 
 import os
 import sys
+from functools import lru_cache
+from importlib import import_module
 
 
+# The ShaperCalibrate object is stateless when created without a printer, so a single
+# instance can be safely shared between all the computations of the process. Klipper's
+# CalibrationData class is also returned, taken from the same module, to be able to wrap
+# an already computed PSD
+@lru_cache(maxsize=1)
 def get_shaper_calibrate_module():
     if os.environ.get('SHAKETUNE_IN_CLI') != '1':
         from ... import shaper_calibrate, shaper_defs
     else:
         shaper_calibrate = sys.modules['shaper_calibrate']
         shaper_defs = sys.modules['shaper_defs']
-    return shaper_calibrate.ShaperCalibrate(printer=None), shaper_defs
-
-
-# Import graph creators
-from .axes_map_graph_creator import AxesMapGraphCreator  # noqa: E402
-
-# Import utilities
-from .base_models import ComputationResult, PlotterStrategy  # noqa: E402
-from .belts_graph_creator import BeltsGraphCreator  # noqa: E402
-
-# Import main components
-from .graph_creator import GraphCreator  # noqa: E402
-from .graph_creator_factory import GraphCreatorFactory  # noqa: E402
-from .plotting_utils import AxesConfiguration  # noqa: E402
-from .plotting_utils import PeakAnnotator  # noqa: E402
-from .plotting_utils import PlottingConstants  # noqa: E402
-from .plotting_utils import SpectrogramHelper, TableHelper  # noqa: E402
-from .shaper_graph_creator import ShaperGraphCreator  # noqa: E402
-from .static_graph_creator import StaticGraphCreator  # noqa: E402
-from .vibrations_graph_creator import VibrationsGraphCreator  # noqa: E402
+    return shaper_calibrate.ShaperCalibrate(printer=None), shaper_defs, shaper_calibrate.CalibrationData
+
+
+# The graph creators and plotting utilities are only imported when they are first accessed (PEP 562)
+# to avoid loading all the heavy dependencies (matplotlib, scipy, etc.) when only one graph type is needed
+_LAZY_IMPORTS = {
+    # Main components
+    'GraphCreator': '.graph_creator',
+    'GraphCreatorFactory': '.graph_creator_factory',
+    # Graph creators
+    'AxesMapGraphCreator': '.axes_map_graph_creator',
+    'BeltsGraphCreator': '.belts_graph_creator',
+    'ShaperGraphCreator': '.shaper_graph_creator',
+    'StaticGraphCreator': '.static_graph_creator',
+    'VibrationsGraphCreator': '.vibrations_graph_creator',
+    # Utilities
+    'ComputationResult': '.base_models',
+    'PlotterStrategy': '.base_models',
+    'PlottingConstants': '.plotting_utils',
+    'AxesConfiguration': '.plotting_utils',
+    'SpectrogramHelper': '.plotting_utils',
+    'TableHelper': '.plotting_utils',
+    'PeakAnnotator': '.plotting_utils',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        obj = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = obj  # Cache it to not go through __getattr__ again
+        return obj
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'GraphCreator',
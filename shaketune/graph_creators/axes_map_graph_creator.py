@@ -19,6 +19,8 @@ from .plotters.axes_map_plotter import AxesMapPlotter
 class AxesMapGraphCreator(GraphCreator):
     """Axes map graph creator using composition-based architecture"""
 
+    __slots__ = ('_accel', '_segment_length')
+
     def __init__(self, config: ShakeTuneConfig):
         super().__init__(config, AxesMapComputation, AxesMapPlotter)
         self._accel: Optional[int] = None
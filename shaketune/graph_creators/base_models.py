@@ -6,16 +6,24 @@
 # File: base_models.py
 # Description: Base data models and interfaces for graph creators
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Protocol, Tuple, runtime_checkable
 
 from matplotlib.figure import Figure
 
 from ..helpers.accelerometer import Measurement
 
+# Use slotted dataclasses for the data models when available (Python 3.10+) to reduce their memory
+# footprint and speed up the attributes access. Python 3.9 is still supported with regular dataclasses
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class GraphMetadata:
     """Metadata for graph generation"""
 
@@ -26,16 +34,23 @@ class GraphMetadata:
     additional_info: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ComputationResult(ABC):
     """Base class for computation results"""
 
     metadata: GraphMetadata
     measurements: List[Measurement]
+    _plot_data: Optional[Mapping[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def get_plot_data(self) -> Mapping[str, Any]:
+        """Return a read-only view of the data formatted for plotting (only built on the first call)"""
+        if self._plot_data is None:
+            self._plot_data = MappingProxyType(self._build_plot_data())
+        return self._plot_data
 
     @abstractmethod
-    def get_plot_data(self) -> Dict[str, Any]:
-        """Return data formatted for plotting"""
+    def _build_plot_data(self) -> Dict[str, Any]:
+        """Build the data formatted for plotting"""
         pass
 
 
@@ -68,26 +83,53 @@ class PlotterStrategy(ABC):
         'red_pink': '#F2055C',
     }
 
+    # Decoded logo image shared by all the plotters (None: not loaded yet, False: logo file not found)
+    _LOGO_CACHE: ClassVar[Any] = None
+
     def __init__(self):
         self._logo_image = None
+        self._figure = None
         self._load_logo()
 
     def _load_logo(self):
-        """Load the logo image"""
-        import os
+        """Load the logo image (only decoded once and then reused by all plotters)"""
+        if PlotterStrategy._LOGO_CACHE is None:
+            import os
 
-        import matplotlib.pyplot as plt
+            import matplotlib.image
 
-        current_dir = os.path.dirname(__file__)
-        image_path = os.path.join(current_dir, 'klippain.png')
-        if os.path.exists(image_path):
-            self._logo_image = plt.imread(image_path)
+            current_dir = os.path.dirname(__file__)
+            image_path = os.path.join(current_dir, 'klippain.png')
+            PlotterStrategy._LOGO_CACHE = matplotlib.image.imread(image_path) if os.path.exists(image_path) else False
+
+        if PlotterStrategy._LOGO_CACHE is not False:
+            self._logo_image = PlotterStrategy._LOGO_CACHE
 
     @abstractmethod
     def plot(self, data: ComputationResult) -> Figure:
         """Create a plot from computation result"""
         pass
 
+    def get_figure(self, figsize: Tuple[float, float]) -> Figure:
+        """Get a blank figure to plot on (the same figure is cleared and reused between plots)"""
+        if self._figure is None:
+            # The figure is created without pyplot since it's only ever saved to a PNG file: this avoids
+            # resolving and loading a (possibly interactive) backend and keeping the figure alive in the
+            # pyplot figures registry. savefig() then renders it with the Agg canvas.
+            self._figure = Figure(figsize=figsize)
+        else:
+            self._figure.clear()
+            self._figure.set_size_inches(figsize)
+        return self._figure
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def parse_measurement_name(name: str) -> Tuple[str, str]:
+        """Get the formatted date and the axis from a measurement name (<prefix>_<axis>_<date>_<time>[_...])"""
+        filename_parts = name.split('_')
+        dt = datetime.strptime(f'{filename_parts[2]} {filename_parts[3]}', '%Y%m%d %H%M%S')
+        return dt.strftime('%x %X'), filename_parts[1]
+
     def add_logo(self, fig: Figure, position: List[float] = None) -> None:
         """Add logo to the figure"""
         if position is None:
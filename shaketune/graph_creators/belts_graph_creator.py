@@ -20,6 +20,8 @@ from .plotters.belts_plotter import BeltsPlotter
 class BeltsGraphCreator(GraphCreator):
     """Belts graph creator using composition-based architecture"""
 
+    __slots__ = ('_kinematics', '_test_params', '_max_scale')
+
     def __init__(self, config: ShakeTuneConfig):
         super().__init__(config, BeltsComputation, BeltsPlotter)
         self._kinematics: Optional[str] = None
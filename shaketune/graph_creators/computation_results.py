@@ -11,10 +11,10 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
-from .base_models import ComputationResult
+from .base_models import DATACLASS_SLOTS, ComputationResult
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AxesMapResult(ComputationResult):
     """Result from axes map detection computation"""
 
@@ -27,7 +27,7 @@ class AxesMapResult(ComputationResult):
     formatted_direction_vector: str
     accel: Optional[float] = None
 
-    def get_plot_data(self) -> Dict[str, Any]:
+    def _build_plot_data(self) -> Dict[str, Any]:
         return {
             'acceleration_data_0': [d[0] for d in self.acceleration_data],
             'acceleration_data_1': [d[1] for d in self.acceleration_data],
@@ -43,7 +43,7 @@ class AxesMapResult(ComputationResult):
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SignalData:
     """Data for a single signal in belts comparison"""
 
@@ -54,7 +54,7 @@ class SignalData:
     unpaired_peaks: Optional[List[int]] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BeltsResult(ComputationResult):
     """Result from belts comparison computation"""
 
@@ -69,7 +69,7 @@ class BeltsResult(ComputationResult):
     similarity_factor: Optional[float] = None
     mhi: Optional[str] = None
 
-    def get_plot_data(self) -> Dict[str, Any]:
+    def _build_plot_data(self) -> Dict[str, Any]:
         return {
             'signal1': self.signal1,
             'signal2': self.signal2,
@@ -86,7 +86,7 @@ class BeltsResult(ComputationResult):
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class StaticFrequencyResult(ComputationResult):
     """Result from static frequency computation"""
 
@@ -98,7 +98,7 @@ class StaticFrequencyResult(ComputationResult):
     pdata: np.ndarray
     max_freq: float
 
-    def get_plot_data(self) -> Dict[str, Any]:
+    def _build_plot_data(self) -> Dict[str, Any]:
         return {
             'freq': self.freq,
             'duration': self.duration,
@@ -112,7 +112,7 @@ class StaticFrequencyResult(ComputationResult):
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ShaperResult(ComputationResult):
     """Result from input shaper computation"""
 
@@ -136,7 +136,7 @@ class ShaperResult(ComputationResult):
     compat: bool = False
     max_smoothing_computed: Optional[float] = None
 
-    def get_plot_data(self) -> Dict[str, Any]:
+    def _build_plot_data(self) -> Dict[str, Any]:
         return {
             'measurements': self.measurements,
             'compat': self.compat,
@@ -162,7 +162,7 @@ class ShaperResult(ComputationResult):
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class VibrationsResult(ComputationResult):
     """Result from vibrations analysis computation"""
 
@@ -192,7 +192,7 @@ class VibrationsResult(ComputationResult):
     motor_zeta: Optional[float]
     motor_res_idx: Optional[int]
 
-    def get_plot_data(self) -> Dict[str, Any]:
+    def _build_plot_data(self) -> Dict[str, Any]:
         return {
             'measurements': self.measurements,
             'all_speeds': self.all_speeds,
@@ -6,10 +6,10 @@
 # File: belts_computation.py
 # Description: Computation implementation for belts comparison analysis
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List, NamedTuple, Optional, Tuple
 
 import numpy as np
-from scipy.stats import pearsonr
 
 from ...helpers.accelerometer import Measurement
 from ...helpers.common_func import detect_peaks
@@ -21,6 +21,20 @@ from ..computation_results import BeltsResult, SignalData
 PEAKS_DETECTION_THRESHOLD = 0.1  # Threshold to detect peaks in the PSD signal (10% of max)
 DC_MAX_PEAKS = 2  # Maximum ideal number of peaks
 DC_MAX_UNPAIRED_PEAKS_ALLOWED = 0  # No unpaired peaks are tolerated
+SYMMETRIC_KINEMATICS = frozenset({'limited_corexy', 'corexy', 'limited_corexz', 'corexz'})  # Kinematics with MHI
+
+# MHI ranges boundaries and their textual descriptions (the labels are the ones for the (lower, upper] ranges)
+MHI_THRESHOLDS = np.array([0, 15, 30, 45, 55, 70, 100])
+MHI_LABELS = [
+    'Unknown mechanical health',
+    'Mechanical issue detected',
+    'Likely a mechanical issue',
+    'Potential signs of a mechanical issue',
+    'Acceptable mechanical health',
+    'Good mechanical health',
+    'Excellent mechanical health',
+    'Unknown mechanical health',
+]
 
 
 class PeakPairingResult(NamedTuple):
@@ -50,6 +64,9 @@ class BeltsComputation:
         self.max_scale = max_scale
         self.st_version = st_version
 
+        # Common frequency grid on which both PSD signals are re-interpolated
+        self._common_freqs = np.linspace(0, self.max_freq, 500)
+
     def compute(self) -> BeltsResult:
         """Perform belts comparison computation"""
         if len(self.measurements) != 2:
@@ -58,7 +75,7 @@ class BeltsComputation:
                 f'measurements named {[meas.get("name", "unknown") for meas in self.measurements]}'
             )
 
-        datas = [np.array(m['samples']) for m in self.measurements if m['samples'] is not None]
+        datas = [np.asarray(m['samples'], dtype=np.float64) for m in self.measurements if m['samples'] is not None]
 
         # Get belt names for labels
         belt_info = {'A': ' (axis 1,-1)', 'B': ' (axis 1, 1)'}
@@ -68,35 +85,30 @@ class BeltsComputation:
         signal2_belt += belt_info.get(signal2_belt, '')
 
         # Compute calibration data
-        common_freqs = np.linspace(0, self.max_freq, 500)
-        signal1 = self._compute_signal_data(datas[0], common_freqs, self.max_freq)
-        signal2 = self._compute_signal_data(datas[1], common_freqs, self.max_freq)
+        common_freqs = self._common_freqs
+
+        # Both signals are independent and the heavy lifting is done in NumPy/SciPy (that release
+        # the GIL), so they can be processed concurrently to use two CPU cores when available
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(self._compute_signal_data, datas[0], common_freqs, self.max_freq)
+            future2 = executor.submit(self._compute_signal_data, datas[1], common_freqs, self.max_freq)
+            signal1, signal2 = future1.result(), future2.result()
         del datas
 
         # Pair peaks
         pairing_result = self._pair_peaks(
             signal1.peaks, signal1.freqs, signal1.psd, signal2.peaks, signal2.freqs, signal2.psd
         )
-        signal1 = SignalData(
-            freqs=signal1.freqs,
-            psd=signal1.psd,
-            peaks=signal1.peaks,
-            paired_peaks=pairing_result.paired_peaks,
-            unpaired_peaks=pairing_result.unpaired_peaks1,
-        )
-        signal2 = SignalData(
-            freqs=signal2.freqs,
-            psd=signal2.psd,
-            peaks=signal2.peaks,
-            paired_peaks=pairing_result.paired_peaks,
-            unpaired_peaks=pairing_result.unpaired_peaks2,
-        )
+        signal1.paired_peaks = pairing_result.paired_peaks
+        signal1.unpaired_peaks = pairing_result.unpaired_peaks1
+        signal2.paired_peaks = pairing_result.paired_peaks
+        signal2.unpaired_peaks = pairing_result.unpaired_peaks2
 
         # Compute similarity factor and MHI if needed (for symmetric kinematics)
         similarity_factor = None
         mhi = None
-        if self.kinematics in {'limited_corexy', 'corexy', 'limited_corexz', 'corexz'}:
-            correlation, _ = pearsonr(signal1.psd, signal2.psd)
+        if self.kinematics in SYMMETRIC_KINEMATICS:
+            correlation = self._compute_correlation(signal1.psd, signal2.psd)
             similarity_factor = correlation * 100
             similarity_factor = np.clip(similarity_factor, 0, 100)
             ConsoleOutput.print(f'Belts estimated similarity: {similarity_factor:.1f}%')
@@ -131,14 +143,20 @@ class BeltsComputation:
 
     def _compute_signal_data(self, data: np.ndarray, common_freqs: np.ndarray, max_freq: float) -> SignalData:
         """Compute signal data from raw measurements"""
-        shaper_calibrate, _ = get_shaper_calibrate_module()
+        shaper_calibrate, _, _ = get_shaper_calibrate_module()
         calibration_data = shaper_calibrate.process_accelerometer_data(data)
 
-        freqs = calibration_data.freq_bins[calibration_data.freq_bins <= max_freq]
-        psd = calibration_data.get_psd('all')[calibration_data.freq_bins <= max_freq]
+        # freq_bins is sorted in ascending order, so the max_freq cutoff can be found directly
+        cutoff = np.searchsorted(calibration_data.freq_bins, max_freq, side='right')
+        freqs = calibration_data.freq_bins[:cutoff]
+        psd = calibration_data.get_psd('all')[:cutoff]
 
-        # Re-interpolate the PSD signal to a common frequency range
-        interp_psd = np.interp(common_freqs, freqs, psd)
+        # Re-interpolate the PSD signal to a common frequency range (if not already on it). The
+        # result is stored as float32 since it's plenty enough for the correlation and peak detection
+        if freqs.size == common_freqs.size and np.allclose(freqs, common_freqs, rtol=0, atol=1e-6):
+            interp_psd = psd.astype(np.float32)
+        else:
+            interp_psd = np.interp(common_freqs, freqs, psd).astype(np.float32)
 
         _, peaks, _ = detect_peaks(
             interp_psd,
@@ -160,58 +178,58 @@ class BeltsComputation:
         psd2: np.ndarray,
     ) -> PeakPairingResult:
         """Pair peaks between two signals based on frequency proximity"""
-        # Compute a dynamic detection threshold
-        distances = []
-        for p1 in peaks1:
-            for p2 in peaks2:
-                distances.append(abs(freqs1[p1] - freqs2[p2]))
-        distances = np.array(distances)
+        peaks1 = np.asarray(peaks1, dtype=np.intp)
+        peaks2 = np.asarray(peaks2, dtype=np.intp)
+
+        # Compute all the pairwise frequency distances at once
+        distances = np.abs(freqs1[peaks1][:, None] - freqs2[peaks2][None, :])
 
-        if len(distances) > 0:
+        # Compute a dynamic detection threshold
+        if distances.size > 0:
             median_distance = np.median(distances)
-            iqr = np.percentile(distances, 75) - np.percentile(distances, 25)
+            iqr = np.subtract(*np.percentile(distances, [75, 25]))
             threshold = median_distance + 1.5 * iqr
             threshold = min(threshold, 10)
         else:
             threshold = 10
 
-        # Pair the peaks using the dynamic threshold
+        # Greedily pair the closest peaks using the dynamic threshold. Once paired, a peak
+        # row/column is masked out with inf so that it can't be selected anymore
         paired_peaks = []
-        unpaired_peaks1 = list(peaks1)
-        unpaired_peaks2 = list(peaks2)
+        is_paired1 = np.zeros(len(peaks1), dtype=bool)
+        is_paired2 = np.zeros(len(peaks2), dtype=bool)
 
-        while unpaired_peaks1 and unpaired_peaks2:
-            min_distance = threshold + 1
-            pair = None
-
-            for p1 in unpaired_peaks1:
-                for p2 in unpaired_peaks2:
-                    distance = abs(freqs1[p1] - freqs2[p2])
-                    if distance < min_distance:
-                        min_distance = distance
-                        pair = (p1, p2)
-
-            if pair is None:  # No more pairs below the threshold
+        while distances.size > 0:
+            i, j = divmod(int(distances.argmin()), distances.shape[1])
+            if not distances[i, j] < threshold + 1:  # No more pairs below the threshold
                 break
 
-            p1, p2 = pair
+            p1, p2 = peaks1[i], peaks2[j]
             paired_peaks.append(((p1, freqs1[p1], psd1[p1]), (p2, freqs2[p2], psd2[p2])))
-            unpaired_peaks1.remove(p1)
-            unpaired_peaks2.remove(p2)
+            is_paired1[i] = True
+            is_paired2[j] = True
+            distances[i, :] = np.inf
+            distances[:, j] = np.inf
+
+        unpaired_peaks1 = list(peaks1[~is_paired1])
+        unpaired_peaks2 = list(peaks2[~is_paired2])
 
         return PeakPairingResult(
             paired_peaks=paired_peaks, unpaired_peaks1=unpaired_peaks1, unpaired_peaks2=unpaired_peaks2
         )
 
+    def _compute_correlation(self, psd1: np.ndarray, psd2: np.ndarray) -> float:
+        """Compute the Pearson correlation coefficient between two PSD signals"""
+        # Only the coefficient is needed here, so this avoids the p-value computation of scipy's pearsonr
+        centered1 = psd1 - psd1.mean()
+        centered2 = psd2 - psd2.mean()
+        return float(centered1 @ centered2 / (np.sqrt(centered1 @ centered1) * np.sqrt(centered2 @ centered2)))
+
     def _compute_mhi(self, similarity_factor: float, signal1: SignalData, signal2: SignalData) -> str:
         """Compute Mechanical Health Indicator"""
         num_unpaired_peaks = len(signal1.unpaired_peaks) + len(signal2.unpaired_peaks)
         num_paired_peaks = len(signal1.paired_peaks)
 
-        # Combine unpaired peaks from both signals
-        combined_unpaired_peaks = [(peak, signal1) for peak in signal1.unpaired_peaks] + [
-            (peak, signal2) for peak in signal2.unpaired_peaks
-        ]
         psd_highest_max = max(signal1.psd.max(), signal2.psd.max())
 
         # Start with the similarity factor directly scaled to a percentage
@@ -222,10 +240,12 @@ class BeltsComputation:
             mhi *= DC_MAX_PEAKS / num_paired_peaks  # Reduce MHI if more than ideal number of peaks
 
         # Penalty from unpaired peaks weighted by their amplitude
-        unpaired_peak_penalty = 0
         if num_unpaired_peaks > DC_MAX_UNPAIRED_PEAKS_ALLOWED:
-            for peak, signal in combined_unpaired_peaks:
-                unpaired_peak_penalty += (signal.psd[peak] / psd_highest_max) * 30
+            unpaired_peaks_amplitude = (
+                signal1.psd[np.asarray(signal1.unpaired_peaks, dtype=np.intp)].sum()
+                + signal2.psd[np.asarray(signal2.unpaired_peaks, dtype=np.intp)].sum()
+            )
+            unpaired_peak_penalty = unpaired_peaks_amplitude / psd_highest_max * 30
             mhi -= unpaired_peak_penalty
 
         # Ensure the result lies between 0 and 100
@@ -235,16 +255,7 @@ class BeltsComputation:
 
     def _mhi_lut(self, mhi: float) -> str:
         """Convert MHI value to textual description"""
-        ranges = [
-            (70, 100, 'Excellent mechanical health'),
-            (55, 70, 'Good mechanical health'),
-            (45, 55, 'Acceptable mechanical health'),
-            (30, 45, 'Potential signs of a mechanical issue'),
-            (15, 30, 'Likely a mechanical issue'),
-            (0, 15, 'Mechanical issue detected'),
-        ]
         mhi = np.clip(mhi, 0, 100)
-        return next(
-            (message for lower, upper, message in ranges if lower < mhi <= upper),
-            'Unknown mechanical health',
-        )
+        # Find the (lower, upper] range containing the MHI value. Values outside of all ranges (ie. 0 or NaN)
+        # fall on the first or last index, that are both 'Unknown mechanical health'
+        return MHI_LABELS[np.searchsorted(MHI_THRESHOLDS, mhi, side='left')]
@@ -11,7 +11,7 @@ from typing import Any, List, Optional
 import numpy as np
 
 from ...helpers.accelerometer import Measurement
-from ...helpers.common_func import compute_mechanical_parameters, compute_spectrogram, detect_peaks
+from ...helpers.common_func import compute_mechanical_parameters, compute_psd_and_spectrogram, detect_peaks
 from ...helpers.console_output import ConsoleOutput
 from .. import get_shaper_calibrate_module
 from ..base_models import GraphMetadata
@@ -20,12 +20,14 @@ from ..computation_results import ShaperResult
 PEAKS_DETECTION_THRESHOLD = 0.05
 PEAKS_EFFECT_THRESHOLD = 0.12
 MAX_VIBRATIONS = 5.0
-MIN_SMOOTHING = 0.001
+MIN_PSD_LEVEL = 1e-9
 
 
 class ShaperComputation:
     """Computation for input shaper calibration"""
 
+    __slots__ = ('measurements', 'max_smoothing', 'scv', 'max_freq', 'test_params', 'max_scale', 'st_version')
+
     def __init__(
         self,
         measurements: List[Measurement],
@@ -51,9 +53,15 @@ class ShaperComputation:
         if len(self.measurements) > 1:
             ConsoleOutput.print('Warning: incorrect number of measurements detected. Only the first one will be used!')
 
-        datas = [np.array(m['samples']) for m in self.measurements if m['samples'] is not None]
+        # Only the first measurement is used, so there is no need to convert all of them to NumPy arrays
+        samples = next((m['samples'] for m in self.measurements if m['samples'] is not None), None)
+        if samples is None:
+            raise ValueError('No valid data found in the provided measurements!')
+        data = np.asarray(samples, dtype=np.float64)
 
-        # Compute shapers, PSD outputs and spectrogram
+        # Compute the PSD and the spectrogram in a single pass, then the shapers from this PSD
+        psd, (pdata, bins, t) = compute_psd_and_spectrogram(data)
+        del data
         (
             k_shaper_choice,
             k_shapers,
@@ -62,69 +70,73 @@ class ShaperComputation:
             fr,
             zeta,
             compat,
-        ) = self._calibrate_shaper(datas[0], self.max_smoothing, self.scv, self.max_freq)
-        pdata, bins, t = compute_spectrogram(datas[0])
-        del datas
+        ) = self._calibrate_shaper(psd, self.max_smoothing, self.scv, self.max_freq)
 
-        # Select only the relevant part of the PSD data
+        # Select only the relevant part of the PSD data (freq_bins is sorted in ascending order
+        # so the max_freq cutoff can be found directly and used to slice the arrays without copy)
         freqs = calibration_data.freq_bins
-        calibration_data.psd_sum = calibration_data.psd_sum[freqs <= self.max_freq]
-        calibration_data.psd_x = calibration_data.psd_x[freqs <= self.max_freq]
-        calibration_data.psd_y = calibration_data.psd_y[freqs <= self.max_freq]
-        calibration_data.psd_z = calibration_data.psd_z[freqs <= self.max_freq]
-        calibration_data.freqs = freqs[freqs <= self.max_freq]
+        cutoff = np.searchsorted(freqs, self.max_freq, side='right')
+        calibration_data.psd_sum = calibration_data.psd_sum[:cutoff]
+        calibration_data.psd_x = calibration_data.psd_x[:cutoff]
+        calibration_data.psd_y = calibration_data.psd_y[:cutoff]
+        calibration_data.psd_z = calibration_data.psd_z[:cutoff]
+        calibration_data.freqs = freqs[:cutoff]
 
         # Peak detection algorithm
-        peaks_threshold = [
-            PEAKS_DETECTION_THRESHOLD * calibration_data.psd_sum.max(),
-            PEAKS_EFFECT_THRESHOLD * calibration_data.psd_sum.max(),
-        ]
+        psd_max = calibration_data.psd_sum.max()
+        peaks_threshold = (PEAKS_DETECTION_THRESHOLD * psd_max, PEAKS_EFFECT_THRESHOLD * psd_max)
         num_peaks, peaks, peaks_freqs = detect_peaks(
             calibration_data.psd_sum, calibration_data.freqs, peaks_threshold[0]
         )
 
         # Print the peaks info in the console
-        peak_freqs_formated = ['{:.1f}'.format(f) for f in peaks_freqs]
+        peak_freqs_formatted = np.char.mod('%.1f', peaks_freqs).tolist()
         num_peaks_above_effect_threshold = np.sum(calibration_data.psd_sum[peaks] > peaks_threshold[1])
         ConsoleOutput.print(
-            f'Peaks detected on the graph: {num_peaks} @ {", ".join(map(str, peak_freqs_formated))} Hz ({num_peaks_above_effect_threshold} above effect threshold)'
+            f'Peaks detected on the graph: {num_peaks} @ {", ".join(peak_freqs_formatted)} Hz ({num_peaks_above_effect_threshold} above effect threshold)'
+        )
+
+        # Gather the shapers characteristics into arrays to select the recommended ones
+        shaper_names = [shaper.name for shaper in k_shapers]
+        shaper_freqs = np.fromiter((shaper.freq for shaper in k_shapers), dtype=np.float64, count=len(k_shapers))
+        shaper_vibrs = np.fromiter((shaper.vibrs for shaper in k_shapers), dtype=np.float64, count=len(k_shapers))
+        shaper_accels = np.fromiter((shaper.max_accel for shaper in k_shapers), dtype=np.float64, count=len(k_shapers))
+        shaper_smoothings = np.fromiter(
+            (shaper.smoothing for shaper in k_shapers), dtype=np.float64, count=len(k_shapers)
         )
+        max_smoothing_computed = shaper_smoothings.max(initial=0)
 
-        # Consolidate shaper data for plotting the table summary
+        # Consolidate shaper data for plotting the table summary (one array per column)
         # and data for the shaper recommendation (performance vs low vibration)
         shaper_table_data = {
-            'shapers': [],
+            'shapers': {
+                'type': np.array([name.upper() for name in shaper_names]),
+                'frequency': shaper_freqs,
+                'vibrations': shaper_vibrs,
+                'smoothing': shaper_smoothings,
+                'max_accel': shaper_accels,
+                'vals': [shaper.vals for shaper in k_shapers],  # Kept as a list as they are full response curves
+            },
             'recommendations': [],
             'damping_ratio': zeta,
         }
 
+        # Get the Klipper recommended shaper (usually it's a good low vibration compromise)
+        klipper_shaper_idx = shaper_names.index(k_shaper_choice)
+        klipper_shaper_freq = shaper_freqs[klipper_shaper_idx]
+        klipper_shaper_accel = shaper_accels[klipper_shaper_idx]
+
+        # Find the shaper with the highest accel but with vibrs under MAX_VIBRATIONS as it's
+        # a good performance compromise when injecting the SCV and damping ratio in the computation
         perf_shaper_choice = None
         perf_shaper_freq = None
         perf_shaper_accel = 0
-        max_smoothing_computed = 0
-        for shaper in k_shapers:
-            shaper_info = {
-                'type': shaper.name.upper(),
-                'frequency': shaper.freq,
-                'vibrations': shaper.vibrs,
-                'smoothing': shaper.smoothing,
-                'max_accel': shaper.max_accel,
-                'vals': shaper.vals,
-            }
-            shaper_table_data['shapers'].append(shaper_info)
-            max_smoothing_computed = max(max_smoothing_computed, shaper.smoothing)
-
-            # Get the Klipper recommended shaper (usually it's a good low vibration compromise)
-            if shaper.name == k_shaper_choice:
-                klipper_shaper_freq = shaper.freq
-                klipper_shaper_accel = shaper.max_accel
-
-            # Find the shaper with the highest accel but with vibrs under MAX_VIBRATIONS as it's
-            # a good performance compromise when injecting the SCV and damping ratio in the computation
-            if perf_shaper_accel < shaper.max_accel and shaper.vibrs * 100 < MAX_VIBRATIONS:
-                perf_shaper_choice = shaper.name
-                perf_shaper_accel = shaper.max_accel
-                perf_shaper_freq = shaper.freq
+        perf_candidates_accels = np.where(shaper_vibrs * 100 < MAX_VIBRATIONS, shaper_accels, 0)
+        perf_shaper_idx = int(np.argmax(perf_candidates_accels))
+        if perf_candidates_accels[perf_shaper_idx] > 0:
+            perf_shaper_choice = shaper_names[perf_shaper_idx]
+            perf_shaper_freq = shaper_freqs[perf_shaper_idx]
+            perf_shaper_accel = shaper_accels[perf_shaper_idx]
 
         # Recommendations are put in the console: one is Klipper's original suggestion that is usually good for low vibrations
         # and the other one is the custom "performance" recommendation that looks for a suitable shaper that doesn't have excessive
@@ -186,12 +198,21 @@ class ShaperComputation:
             max_smoothing_computed=max_smoothing_computed,
         )
 
-    def _calibrate_shaper(self, datas: np.ndarray, max_smoothing: Optional[float], scv: float, max_freq: float):
+    def _calibrate_shaper(self, psd: tuple, max_smoothing: Optional[float], scv: float, max_freq: float):
         """Find the best shaper parameters using Klipper's official algorithm"""
-        shaper_calibrate, shaper_defs = get_shaper_calibrate_module()
-        calib_data = shaper_calibrate.process_accelerometer_data(datas)
+        shaper_calibrate, shaper_defs, calibration_data_class = get_shaper_calibrate_module()
+
+        # The PSD was already computed alongside the spectrogram, so it's directly wrapped in Klipper's
+        # CalibrationData object instead of running process_accelerometer_data that would do it again
+        calib_data = calibration_data_class(*psd)
+        calib_data.set_numpy(np)
         calib_data.normalize_to_frequencies()
 
+        # A flat signal (disconnected or failed accelerometer) would only waste time in the shapers
+        # evaluation below to produce meaningless recommendations, so we bail out early
+        if calib_data.psd_sum.max(initial=0) < MIN_PSD_LEVEL:
+            raise ValueError('The measured PSD is effectively zero: check your accelerometer wiring and mounting!')
+
         # We compute the damping ratio using the Klipper's default value if it fails
         fr, zeta, _, _ = compute_mechanical_parameters(calib_data.psd_sum, calib_data.freq_bins)
         zeta = zeta if zeta is not None else 0.1
@@ -228,23 +249,6 @@ class ShaperComputation:
             compat = True
             k_shaper_choice, k_shapers = shaper_calibrate.find_best_shaper(calib_data, max_smoothing, None)
 
-        # Then in a second time, we run again the same computation but with a super low smoothing value to
-        # get the maximum accelerations values for each algorithms.
-        if compat:
-            _, k_shapers_max = shaper_calibrate.find_best_shaper(calib_data, MIN_SMOOTHING, None)
-        else:
-            _, k_shapers_max = shaper_calibrate.find_best_shaper(
-                calib_data,
-                shapers=None,
-                damping_ratio=zeta,
-                scv=scv,
-                shaper_freqs=None,
-                max_smoothing=MIN_SMOOTHING,
-                test_damping_ratios=None,
-                max_freq=max_freq,
-                logger=None,
-            )
-
         return (
             k_shaper_choice.name,
             k_shapers,
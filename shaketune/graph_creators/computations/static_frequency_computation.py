@@ -20,6 +20,8 @@ from ..computation_results import StaticFrequencyResult
 class StaticFrequencyComputation:
     """Computation for static frequency analysis"""
 
+    __slots__ = ('measurements', 'freq', 'duration', 'max_freq', 'accel_per_hz', 'st_version')
+
     def __init__(
         self,
         measurements: List[Measurement],
@@ -44,12 +46,15 @@ class StaticFrequencyComputation:
         if len(self.measurements) > 1:
             ConsoleOutput.print('Warning: incorrect number of measurements detected. Only the first one will be used!')
 
-        # Extract data from measurements
-        datas = [np.array(m['samples']) for m in self.measurements if m['samples'] is not None]
+        # Extract data from the first measurement (the only one used)
+        samples = next((m['samples'] for m in self.measurements if m['samples'] is not None), None)
+        if samples is None:
+            raise ValueError('No valid data found in the provided measurements!')
+        data = np.asarray(samples, dtype=np.float64)
 
         # Compute spectrogram
-        pdata, bins, t = compute_spectrogram(datas[0])
-        del datas
+        pdata, bins, t = compute_spectrogram(data)
+        del data
 
         # Create metadata
         metadata = GraphMetadata(
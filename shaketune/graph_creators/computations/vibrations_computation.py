@@ -62,7 +62,7 @@ class VibrationsComputation:
         target_freqs_initialized = False
         target_freqs = None
 
-        shaper_calibrate, _ = get_shaper_calibrate_module()
+        shaper_calibrate, _, _ = get_shaper_calibrate_module()
 
         for measurement in self.measurements:
             data = np.array(measurement['samples'])
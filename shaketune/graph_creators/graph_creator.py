@@ -8,6 +8,8 @@
 
 
 import abc
+import heapq
+import os
 from pathlib import Path
 from typing import Optional, Type
 
@@ -21,6 +23,10 @@ from .base_models import Computation, PlotterStrategy
 class GraphCreator(abc.ABC):
     """Base class for graph creators using composition-based architecture"""
 
+    # Graph creators only hold a fixed set of attributes, so they don't need a per-instance __dict__
+    # (subclasses must also define their own __slots__ to keep this benefit)
+    __slots__ = ('_config', '_version', '_type', '_folder', '_output_target', '_computation_class', '_plotter')
+
     registry = {}
 
     @classmethod
@@ -70,7 +76,12 @@ class GraphCreator(abc.ABC):
                 'Output target not defined. Please call define_output_target() before trying to save the figure!'
             )
 
-        fig.savefig(f'{self._output_target.with_suffix(".png")}', dpi=self._config.dpi)
+        # A low zlib compression level is used as the PNG encoding is otherwise a big part of the saving time
+        fig.savefig(
+            f'{self._output_target.with_suffix(".png")}',
+            dpi=self._config.dpi,
+            pil_kwargs={'compress_level': 1, 'optimize': False},
+        )
         if not self._config.keep_raw_data:
             self._output_target.with_suffix('.stdata').unlink(missing_ok=True)
 
@@ -91,10 +102,21 @@ class GraphCreator(abc.ABC):
 
     def clean_old_files(self, keep_results: int = 10) -> None:
         """Clean old result files"""
-        files = sorted(self._folder.glob('*.png'), key=lambda f: f.stat().st_mtime, reverse=True)
-        if len(files) <= keep_results:
+        # Only stat each file once and just pick the newest ones instead of sorting all of them
+        try:
+            with os.scandir(self._folder) as entries:
+                png_files = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith('.png')]
+        except FileNotFoundError:
+            return  # No results folder, so nothing to clean
+
+        if len(png_files) <= keep_results:
             return  # No need to delete any files
-        for old_png_file in files[keep_results:]:
+
+        files_to_keep = {path for _, path in heapq.nlargest(keep_results, png_files)}
+        for _, path in png_files:
+            if path in files_to_keep:
+                continue
+            old_png_file = Path(path)
             stdata_file = old_png_file.with_suffix('.stdata')
             stdata_file.unlink(missing_ok=True)
             old_png_file.unlink()
@@ -6,9 +6,21 @@
 # File: graph_creator_factory.py
 # Description: Factory class for creating graph creators
 
+from importlib import import_module
+
 from ..shaketune_config import ShakeTuneConfig
 from .graph_creator import GraphCreator
 
+# Modules defining the graph creators. They register themselves in the GraphCreator registry
+# when imported, so only the one that is actually requested needs to be loaded
+GRAPH_CREATOR_MODULES = {
+    'axes map': '.axes_map_graph_creator',
+    'belts comparison': '.belts_graph_creator',
+    'input shaper': '.shaper_graph_creator',
+    'static frequency': '.static_graph_creator',
+    'vibrations profile': '.vibrations_graph_creator',
+}
+
 
 class GraphCreatorFactory:
     """Factory for creating graph creators"""
@@ -16,6 +28,8 @@ class GraphCreatorFactory:
     @staticmethod
     def create_graph_creator(graph_type: str, config: ShakeTuneConfig) -> GraphCreator:
         """Create a graph creator instance based on the type"""
+        if graph_type not in GraphCreator.registry and graph_type in GRAPH_CREATOR_MODULES:
+            import_module(GRAPH_CREATOR_MODULES[graph_type], __package__)
 
         if creator_class := GraphCreator.registry.get(graph_type):
             return creator_class(config)
@@ -6,11 +6,10 @@
 # File: axes_map_plotter.py
 # Description: Plotter for axes map detection graphs
 
-from datetime import datetime
 from typing import Any, Dict
 
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
 from ..base_models import PlotterStrategy
@@ -25,7 +24,7 @@ class AxesMapPlotter(PlotterStrategy):
         """Create axes map detection graph"""
         data = result.get_plot_data()
 
-        fig = plt.figure(figsize=(15, 7))
+        fig = self.get_figure(figsize=(15, 7))
         gs = fig.add_gridspec(
             1, 2, width_ratios=[5, 3], bottom=0.080, top=0.840, left=0.055, right=0.960, hspace=0.166, wspace=0.060
         )
@@ -48,9 +47,7 @@ class AxesMapPlotter(PlotterStrategy):
     def _add_titles(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add title lines to the figure"""
         try:
-            filename = data['measurements'][0]['name']
-            dt = datetime.strptime(f'{filename.split("_")[2]} {filename.split("_")[3]}', '%Y%m%d %H%M%S')
-            title_line2 = dt.strftime('%x %X')
+            title_line2, _ = self.parse_measurement_name(data['measurements'][0]['name'])
             if data['accel'] is not None:
                 title_line2 += f' -- at {data["accel"]:0.0f} mm/s²'
         except Exception:
@@ -75,31 +72,28 @@ class AxesMapPlotter(PlotterStrategy):
         time_data = data['acceleration_data_0']
         accel_data = data['acceleration_data_1']
 
-        for i, (time, (accel_x, accel_y, accel_z)) in enumerate(zip(time_data, accel_data)):
-            ax.plot(
-                time,
-                accel_x,
-                label='X' if i == 0 else '',
-                color=PlottingConstants.KLIPPAIN_COLORS['purple'],
-                linewidth=0.5,
-                zorder=50 if i == 0 else 10,
+        # The traces of each axis are batched in two LineCollection artists: one for the measurement made
+        # along this same axis (drawn on top of the others) and one for all the other measurements
+        for axis_idx, (label, color) in enumerate((('X', 'purple'), ('Y', 'orange'), ('Z', 'red_pink'))):
+            segments = [np.column_stack((time, accel[axis_idx])) for time, accel in zip(time_data, accel_data)]
+            ax.add_collection(
+                LineCollection(
+                    segments[:axis_idx] + segments[axis_idx + 1 :],
+                    colors=PlottingConstants.KLIPPAIN_COLORS[color],
+                    linewidths=0.5,
+                    zorder=10,
+                )
             )
-            ax.plot(
-                time,
-                accel_y,
-                label='Y' if i == 0 else '',
-                color=PlottingConstants.KLIPPAIN_COLORS['orange'],
-                linewidth=0.5,
-                zorder=50 if i == 1 else 10,
-            )
-            ax.plot(
-                time,
-                accel_z,
-                label='Z' if i == 0 else '',
-                color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
-                linewidth=0.5,
-                zorder=50 if i == 2 else 10,
+            ax.add_collection(
+                LineCollection(
+                    segments[axis_idx : axis_idx + 1],
+                    label=label,
+                    colors=PlottingConstants.KLIPPAIN_COLORS[color],
+                    linewidths=0.5,
+                    zorder=50,
+                )
             )
+        ax.autoscale_view()
 
         # Add gravity and noise level to a secondary legend
         ax_2 = ax.twinx()
@@ -123,9 +117,14 @@ class AxesMapPlotter(PlotterStrategy):
         direction_vectors = data['direction_vectors']
         angle_errors = data['angle_errors']
 
-        for i, ((position_x, position_y, position_z), average_direction_vector, angle_error) in enumerate(
-            zip(position_data, direction_vectors, angle_errors)
-        ):
+        # Compute all the average direction vectors endpoints at once: they start at the beginning of each
+        # movement and have the same length as the distance between its start and end positions
+        start_positions = np.array([[px[0], py[0], pz[0]] for px, py, pz in position_data]).reshape(-1, 3)
+        end_positions = np.array([[px[-1], py[-1], pz[-1]] for px, py, pz in position_data]).reshape(-1, 3)
+        lengths = np.linalg.norm(end_positions - start_positions, axis=1)
+        end_positions = start_positions + np.asarray(direction_vectors).reshape(-1, 3) * lengths[:, None]
+
+        for i, ((position_x, position_y, position_z), angle_error) in enumerate(zip(position_data, angle_errors)):
             ax.plot(
                 position_x,
                 position_y,
@@ -153,10 +152,8 @@ class AxesMapPlotter(PlotterStrategy):
             )
 
             # Plot average direction vector
-            start_position = np.array([position_x[0], position_y[0], position_z[0]])
-            end_position = start_position + average_direction_vector * np.linalg.norm(
-                [position_x[-1] - position_x[0], position_y[-1] - position_y[0], position_z[-1] - position_z[0]]
-            )
+            start_position = start_positions[i]
+            end_position = end_positions[i]
             ax.plot(
                 [start_position[0], end_position[0]],
                 [start_position[1], end_position[1]],
@@ -6,11 +6,10 @@
 # File: belts_plotter.py
 # Description: Plotter for belts comparison graphs
 
-from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
 from ..base_models import PlotterStrategy
@@ -25,7 +24,8 @@ class BeltsPlotter(PlotterStrategy):
         """Create belts comparison graph"""
         data = result.get_plot_data()
 
-        fig, axes = plt.subplots(
+        fig = self.get_figure(figsize=(15, 7))
+        axes = fig.subplots(
             1,
             2,
             gridspec_kw={
@@ -37,7 +37,6 @@ class BeltsPlotter(PlotterStrategy):
                 'hspace': 0.166,
                 'wspace': 0.138,
             },
-            figsize=(15, 7),
         )
         ax_1, ax_2 = axes
 
@@ -46,20 +45,28 @@ class BeltsPlotter(PlotterStrategy):
         self.add_logo(fig)
         self.add_version_text(fig, data['st_version'])
 
+        # Gather the paired peaks indices once, as they are used by both subplots
+        paired_peaks = data['signal1'].paired_peaks
+        paired_indices = (
+            np.fromiter((peak1[0] for peak1, _ in paired_peaks), dtype=np.intp, count=len(paired_peaks)),
+            np.fromiter((peak2[0] for _, peak2 in paired_peaks), dtype=np.intp, count=len(paired_peaks)),
+        )
+
+        # Same for the highest PSD value that is used to scale both subplots
+        psd_highest_max = max(data['signal1'].psd.max(), data['signal2'].psd.max())
+
         # Plot PSD signals
-        self._plot_psd_signals(ax_1, data)
+        self._plot_psd_signals(ax_1, data, paired_indices, psd_highest_max)
 
         # Plot cross-belts comparison
-        self._plot_cross_comparison(ax_2, data)
+        self._plot_cross_comparison(ax_2, data, paired_indices, psd_highest_max)
 
         return fig
 
     def _add_titles(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add title lines to the figure"""
         try:
-            filename = data['measurements'][0]['name']
-            dt = datetime.strptime(f'{filename.split("_")[2]} {filename.split("_")[3]}', '%Y%m%d %H%M%S')
-            title_line2 = dt.strftime('%x %X')
+            title_line2, _ = self.parse_measurement_name(data['measurements'][0]['name'])
             if data['kinematics'] is not None:
                 title_line2 += ' -- ' + data['kinematics'].upper() + ' kinematics'
         except Exception:
@@ -106,7 +113,9 @@ class BeltsPlotter(PlotterStrategy):
 
         self.add_title(fig, title_lines)
 
-    def _plot_psd_signals(self, ax, data: Dict[str, Any]) -> None:
+    def _plot_psd_signals(
+        self, ax, data: Dict[str, Any], paired_indices: Tuple[np.ndarray, np.ndarray], psd_highest_max: float
+    ) -> None:
         """Plot PSD signals and annotate peaks"""
         signal1 = data['signal1']
         signal2 = data['signal2']
@@ -125,12 +134,11 @@ class BeltsPlotter(PlotterStrategy):
             color=PlottingConstants.KLIPPAIN_COLORS['purple'],
         )
 
-        psd_highest_max = max(signal1.psd.max(), signal2.psd.max())
         ax.set_xlim([0, data['max_freq']])
         ax.set_ylim([0, data['max_scale'] if data['max_scale'] is not None else psd_highest_max * 1.1])
 
         # Annotate peaks
-        self._annotate_psd_peaks(ax, signal1, signal2, psd_highest_max)
+        self._annotate_psd_peaks(ax, signal1, signal2, paired_indices)
 
         # Add unpaired peaks count to secondary legend
         unpaired_count = len(signal1.unpaired_peaks) + len(signal2.unpaired_peaks)
@@ -150,54 +158,59 @@ class BeltsPlotter(PlotterStrategy):
 
         # Add offset table if there are paired peaks
         if len(signal1.paired_peaks) > 0:
-            self._add_offset_table(ax, signal1, psd_highest_max)
+            self._add_offset_table(ax, signal1, paired_indices, psd_highest_max)
 
-    def _annotate_psd_peaks(self, ax, signal1, signal2, psd_highest_max):
+    def _annotate_psd_peaks(self, ax, signal1, signal2, paired_indices):
         """Annotate paired and unpaired peaks on PSD plot"""
-        paired_peak_count = 0
-        unpaired_peak_count = 0
+        # All the peak markers are drawn with a single artist and all the paired peaks connectors
+        # with a single LineCollection, as creating one artist per peak is what's costly in matplotlib
+        idx1, idx2 = paired_indices
+        unpaired1 = np.asarray(signal1.unpaired_peaks, dtype=np.intp)
+        unpaired2 = np.asarray(signal2.unpaired_peaks, dtype=np.intp)
+
+        marker_freqs = np.concatenate(
+            (signal1.freqs[idx1], signal2.freqs[idx2], signal1.freqs[unpaired1], signal2.freqs[unpaired2])
+        )
+        marker_psds = np.concatenate(
+            (signal1.psd[idx1], signal2.psd[idx2], signal1.psd[unpaired1], signal2.psd[unpaired2])
+        )
+        if len(marker_freqs) > 0:
+            ax.plot(marker_freqs, marker_psds, 'x', color='black')
 
         # Annotate paired peaks
-        for _, (peak1, peak2) in enumerate(signal1.paired_peaks):
-            label = PlottingConstants.ALPHABET[paired_peak_count]
-
-            ax.plot(signal1.freqs[peak1[0]], signal1.psd[peak1[0]], 'x', color='black')
-            ax.plot(signal2.freqs[peak2[0]], signal2.psd[peak2[0]], 'x', color='black')
-            ax.plot(
-                [signal1.freqs[peak1[0]], signal2.freqs[peak2[0]]],
-                [signal1.psd[peak1[0]], signal2.psd[peak2[0]]],
-                ':',
-                color='gray',
+        if len(idx1) > 0:
+            segments = np.stack(
+                (
+                    np.column_stack((signal1.freqs[idx1], signal1.psd[idx1])),
+                    np.column_stack((signal2.freqs[idx2], signal2.psd[idx2])),
+                ),
+                axis=1,
             )
+            ax.add_collection(LineCollection(segments, linestyles=':', colors='gray'))
 
-            PeakAnnotator.annotate_peak(ax, signal1.freqs[peak1[0]], signal1.psd[peak1[0]], label + '1')
-            PeakAnnotator.annotate_peak(ax, signal2.freqs[peak2[0]], signal2.psd[peak2[0]], label + '2')
-            paired_peak_count += 1
+        for paired_peak_count, (peak1, peak2) in enumerate(zip(idx1, idx2)):
+            label = PlottingConstants.ALPHABET[paired_peak_count]
+            PeakAnnotator.annotate_peak(ax, signal1.freqs[peak1], signal1.psd[peak1], label + '1')
+            PeakAnnotator.annotate_peak(ax, signal2.freqs[peak2], signal2.psd[peak2], label + '2')
 
         # Annotate unpaired peaks
-        for peak in signal1.unpaired_peaks:
-            ax.plot(signal1.freqs[peak], signal1.psd[peak], 'x', color='black')
-            PeakAnnotator.annotate_peak(
-                ax, signal1.freqs[peak], signal1.psd[peak], str(unpaired_peak_count + 1), color='red', weight='bold'
-            )
-            unpaired_peak_count += 1
-
-        for peak in signal2.unpaired_peaks:
-            ax.plot(signal2.freqs[peak], signal2.psd[peak], 'x', color='black')
+        unpaired_peaks = [(signal1, peak) for peak in unpaired1] + [(signal2, peak) for peak in unpaired2]
+        for unpaired_peak_count, (signal, peak) in enumerate(unpaired_peaks):
             PeakAnnotator.annotate_peak(
-                ax, signal2.freqs[peak], signal2.psd[peak], str(unpaired_peak_count + 1), color='red', weight='bold'
+                ax, signal.freqs[peak], signal.psd[peak], str(unpaired_peak_count + 1), color='red', weight='bold'
             )
-            unpaired_peak_count += 1
 
-    def _add_offset_table(self, ax, signal1, psd_highest_max):
+    def _add_offset_table(self, ax, signal1, paired_indices, psd_highest_max):
         """Add table showing frequency and amplitude offsets"""
-        offsets_table_data = []
-
-        for _, (peak1, peak2) in enumerate(signal1.paired_peaks):
-            label = PlottingConstants.ALPHABET[_]
-            amplitude_offset = abs(((signal1.psd[peak2[0]] - signal1.psd[peak1[0]]) / psd_highest_max) * 100)
-            frequency_offset = abs(signal1.freqs[peak2[0]] - signal1.freqs[peak1[0]])
-            offsets_table_data.append([f'Peaks {label}', f'{frequency_offset:.1f} Hz', f'{amplitude_offset:.1f} %'])
+        idx1, idx2 = paired_indices
+        amplitude_offsets = np.abs((signal1.psd[idx2] - signal1.psd[idx1]) / psd_highest_max) * 100
+        frequency_offsets = np.abs(signal1.freqs[idx2] - signal1.freqs[idx1])
+        offsets_table_data = [
+            [f'Peaks {label}', f'{frequency_offset:.1f} Hz', f'{amplitude_offset:.1f} %']
+            for label, frequency_offset, amplitude_offset in zip(
+                PlottingConstants.ALPHABET, frequency_offsets, amplitude_offsets
+            )
+        ]
 
         columns = ['', 'Frequency delta', 'Amplitude delta']
         offset_table = ax.table(
@@ -215,26 +228,32 @@ class BeltsPlotter(PlotterStrategy):
             cell.set_facecolor('white')
             cell.set_alpha(0.6)
 
-    def _plot_cross_comparison(self, ax, data: Dict[str, Any]) -> None:
+    def _plot_cross_comparison(
+        self, ax, data: Dict[str, Any], paired_indices: Tuple[np.ndarray, np.ndarray], max_psd: float
+    ) -> None:
         """Plot cross-belts comparison"""
         signal1 = data['signal1']
         signal2 = data['signal2']
 
         # Plot ideal zone
-        max_psd = max(np.max(signal1.psd), np.max(signal2.psd))
         ideal_line = np.linspace(0, max_psd * 1.1, 500)
-        green_boundary = ideal_line + (0.35 * max_psd * np.exp(-ideal_line / (0.6 * max_psd)))
+        # green_boundary = ideal_line + 0.35 * max_psd * exp(-ideal_line / (0.6 * max_psd)), computed in place
+        green_boundary = np.multiply(ideal_line, -1.0 / (0.6 * max_psd))
+        np.exp(green_boundary, out=green_boundary)
+        green_boundary *= 0.35 * max_psd
+        green_boundary += ideal_line
 
         ax.fill_betweenx(ideal_line, ideal_line, green_boundary, color='green', alpha=0.15)
         ax.fill_between(ideal_line, ideal_line, green_boundary, color='green', alpha=0.15, label='Good zone')
-        ax.plot(ideal_line, ideal_line, '--', label='Ideal line', color='red', linewidth=2)
+        # The ideal line is straight, so only its two ends are needed (the dense grid is only for the fills)
+        ax.plot(ideal_line[[0, -1]], ideal_line[[0, -1]], '--', label='Ideal line', color='red', linewidth=2)
 
         # Plot data
         ax.plot(signal1.psd, signal2.psd, color='dimgrey', marker='o', markersize=1.5)
         ax.fill_betweenx(signal2.psd, signal1.psd, color=PlottingConstants.KLIPPAIN_COLORS['red_pink'], alpha=0.1)
 
         # Annotate peaks
-        self._annotate_cross_peaks(ax, signal1, signal2)
+        self._annotate_cross_peaks(ax, signal1, signal2, paired_indices)
 
         ax.set_xlim([0, max_psd * 1.1])
         ax.set_ylim([0, max_psd * 1.1])
@@ -248,95 +267,67 @@ class BeltsPlotter(PlotterStrategy):
             legend=True,
         )
 
-    def _annotate_cross_peaks(self, ax, signal1, signal2):
+    def _annotate_cross_peaks(self, ax, signal1, signal2, paired_indices):
         """Annotate peaks on cross-comparison plot"""
-        paired_peak_count = 0
-        unpaired_peak_count = 0
+        colors = PlottingConstants.KLIPPAIN_COLORS
+        idx1, idx2 = paired_indices
+        unpaired1 = np.asarray(signal1.unpaired_peaks, dtype=np.intp)
+        unpaired2 = np.asarray(signal2.unpaired_peaks, dtype=np.intp)
+
+        # Paired peaks at the same frequency are drawn as a single black point while the others are split
+        # into two points (orange for the first belt peak and purple for the second one), like the unpaired peaks
+        close_peaks = np.abs(signal1.freqs[idx1] - signal2.freqs[idx2]) < 1
+        markers_indices = {
+            'black': (idx1[close_peaks], idx2[close_peaks]),
+            colors['orange']: (np.concatenate((idx1[~close_peaks], unpaired1)),) * 2,
+            colors['purple']: (np.concatenate((idx2[~close_peaks], unpaired2)),) * 2,
+        }
+        for color, (x_indices, y_indices) in markers_indices.items():
+            if len(x_indices) > 0:
+                ax.plot(
+                    signal1.psd[x_indices],
+                    signal2.psd[y_indices],
+                    linestyle='none',
+                    marker='o',
+                    color=color,
+                    markersize=7,
+                )
 
         # Annotate paired peaks
-        for _, (peak1, peak2) in enumerate(signal1.paired_peaks):
+        annotation_kwargs = {'textcoords': 'offset points', 'fontsize': 13}
+        for paired_peak_count, (peak1, peak2, close_peak) in enumerate(zip(idx1, idx2, close_peaks)):
             label = PlottingConstants.ALPHABET[paired_peak_count]
-            freq1 = signal1.freqs[peak1[0]]
-            freq2 = signal2.freqs[peak2[0]]
-
-            if abs(freq1 - freq2) < 1:
-                ax.plot(signal1.psd[peak1[0]], signal2.psd[peak2[0]], marker='o', color='black', markersize=7)
+            if close_peak:
                 ax.annotate(
                     f'{label}1/{label}2',
-                    (signal1.psd[peak1[0]], signal2.psd[peak2[0]]),
-                    textcoords='offset points',
+                    (signal1.psd[peak1], signal2.psd[peak2]),
                     xytext=(-7, 7),
-                    fontsize=13,
                     color='black',
+                    **annotation_kwargs,
                 )
             else:
-                ax.plot(
-                    signal1.psd[peak2[0]],
-                    signal2.psd[peak2[0]],
-                    marker='o',
-                    color=PlottingConstants.KLIPPAIN_COLORS['purple'],
-                    markersize=7,
-                )
-                ax.plot(
-                    signal1.psd[peak1[0]],
-                    signal2.psd[peak1[0]],
-                    marker='o',
-                    color=PlottingConstants.KLIPPAIN_COLORS['orange'],
-                    markersize=7,
-                )
                 ax.annotate(
                     f'{label}1',
-                    (signal1.psd[peak1[0]], signal2.psd[peak1[0]]),
-                    textcoords='offset points',
+                    (signal1.psd[peak1], signal2.psd[peak1]),
                     xytext=(0, 7),
-                    fontsize=13,
                     color='black',
+                    **annotation_kwargs,
                 )
                 ax.annotate(
                     f'{label}2',
-                    (signal1.psd[peak2[0]], signal2.psd[peak2[0]]),
-                    textcoords='offset points',
+                    (signal1.psd[peak2], signal2.psd[peak2]),
                     xytext=(0, 7),
-                    fontsize=13,
                     color='black',
+                    **annotation_kwargs,
                 )
-            paired_peak_count += 1
 
         # Annotate unpaired peaks
-        for _, peak_index in enumerate(signal1.unpaired_peaks):
-            ax.plot(
-                signal1.psd[peak_index],
-                signal2.psd[peak_index],
-                marker='o',
-                color=PlottingConstants.KLIPPAIN_COLORS['orange'],
-                markersize=7,
-            )
+        for unpaired_peak_count, peak_index in enumerate(np.concatenate((unpaired1, unpaired2))):
             ax.annotate(
                 str(unpaired_peak_count + 1),
                 (signal1.psd[peak_index], signal2.psd[peak_index]),
-                textcoords='offset points',
-                fontsize=13,
-                weight='bold',
-                color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
                 xytext=(0, 7),
-            )
-            unpaired_peak_count += 1
-
-        for _, peak_index in enumerate(signal2.unpaired_peaks):
-            ax.plot(
-                signal1.psd[peak_index],
-                signal2.psd[peak_index],
-                marker='o',
-                color=PlottingConstants.KLIPPAIN_COLORS['purple'],
-                markersize=7,
-            )
-            ax.annotate(
-                str(unpaired_peak_count + 1),
-                (signal1.psd[peak_index], signal2.psd[peak_index]),
-                textcoords='offset points',
-                fontsize=13,
                 weight='bold',
-                color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
-                xytext=(0, 7),
+                color=colors['red_pink'],
+                **annotation_kwargs,
             )
-            unpaired_peak_count += 1
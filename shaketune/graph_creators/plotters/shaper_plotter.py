@@ -6,12 +6,14 @@
 # File: shaper_plotter.py
 # Description: Plotter for input shaper calibration graphs
 
-from datetime import datetime
+from itertools import cycle
 from typing import Any, Dict
 
 import matplotlib
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 from ..base_models import PlotterStrategy
 from ..computation_results import ShaperResult
@@ -25,7 +27,7 @@ class ShaperPlotter(PlotterStrategy):
         """Create input shaper calibration graph"""
         data = result.get_plot_data()
 
-        fig = plt.figure(figsize=(15, 11.6))
+        fig = self.get_figure(figsize=(15, 11.6))
         gs = fig.add_gridspec(
             2,
             2,
@@ -40,7 +42,7 @@ class ShaperPlotter(PlotterStrategy):
         )
         ax_1 = fig.add_subplot(gs[0, 0])
         ax_2 = fig.add_subplot(gs[1, 0])
-        ax_3 = fig.add_subplot(gs[1, 1])
+        # gs[1, 1] is reserved for the future vibrations vs acceleration curves
 
         # Add titles and logo
         self._add_titles(fig, data)
@@ -53,9 +55,6 @@ class ShaperPlotter(PlotterStrategy):
         # Plot time-frequency spectrogram
         self._plot_spectrogram(ax_2, data)
 
-        # Remove ax_3 for now (TODO: re-add vibrations vs acceleration curves in next release)
-        ax_3.remove()
-
         # Print shaper table
         self._add_shaper_table(fig, data)
 
@@ -67,9 +66,8 @@ class ShaperPlotter(PlotterStrategy):
     def _add_titles(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add title lines to the figure"""
         try:
-            filename_parts = data['measurements'][0]['name'].split('_')
-            dt = datetime.strptime(f'{filename_parts[2]} {filename_parts[3]}', '%Y%m%d %H%M%S')
-            title_line2 = dt.strftime('%x %X') + ' -- ' + filename_parts[1].upper() + ' axis'
+            date, axis = self.parse_measurement_name(data['measurements'][0]['name'])
+            title_line2 = date + ' -- ' + axis.upper() + ' axis'
             if data['compat']:
                 title_line3 = '| Older Klipper version detected, damping ratio'
                 title_line4 = '| and SCV are not used for filter recommendations!'
@@ -125,19 +123,34 @@ class ShaperPlotter(PlotterStrategy):
         ax.set_xlim([0, data['max_freq']])
         ax.set_ylim([0, data['max_scale'] if data['max_scale'] is not None else psd.max() * 1.05])
 
-        # Plot shaper filters on secondary axis
+        # Plot shaper filters on secondary axis: they are all drawn with a single LineCollection
+        # and some proxy artists are created to still get one legend entry per shaper
         ax_2 = ax.twinx()
         ax_2.yaxis.set_visible(False)
-        for shaper in data['shapers']:
-            ax_2.plot(freqs, shaper.vals, label=shaper.name.upper(), linestyle='dotted')
+        shapers_colors = [
+            color for color, _ in zip(cycle(matplotlib.rcParams['axes.prop_cycle'].by_key()['color']), data['shapers'])
+        ]
+        ax_2.add_collection(
+            LineCollection(
+                [np.column_stack((freqs, shaper.vals)) for shaper in data['shapers']],
+                colors=shapers_colors,
+                linestyles='dotted',
+            )
+        )
+        ax_2.autoscale_view()
+        shapers_legend_handles = [
+            Line2D([], [], color=color, linestyle='dotted', label=shaper.name.upper())
+            for shaper, color in zip(data['shapers'], shapers_colors)
+        ]
 
         # Draw shaper filtered PSDs
         shaper_choices = data['shaper_choices']
-        for shaper in data['shaper_table_data']['shapers']:
-            if shaper['type'] == shaper_choices[0]:
-                ax.plot(freqs, psd * shaper['vals'], label=f'With {shaper_choices[0]} applied', color='cyan')
-            if len(shaper_choices) > 1 and shaper['type'] == shaper_choices[1]:
-                ax.plot(freqs, psd * shaper['vals'], label=f'With {shaper_choices[1]} applied', color='lime')
+        shapers = data['shaper_table_data']['shapers']
+        for shaper_type, shaper_vals in zip(shapers['type'], shapers['vals']):
+            if shaper_type == shaper_choices[0]:
+                ax.plot(freqs, psd * shaper_vals, label=f'With {shaper_choices[0]} applied', color='cyan')
+            if len(shaper_choices) > 1 and shaper_type == shaper_choices[1]:
+                ax.plot(freqs, psd * shaper_vals, label=f'With {shaper_choices[1]} applied', color='lime')
 
         # Draw detected peaks
         peaks = data['peaks']
@@ -145,9 +158,8 @@ class ShaperPlotter(PlotterStrategy):
         peaks_threshold = data['peaks_threshold']
 
         ax.plot(peaks_freqs, psd[peaks], 'x', color='black', markersize=8)
-        for idx, peak in enumerate(peaks):
-            fontcolor = 'red' if psd[peak] > peaks_threshold[1] else 'black'
-            fontweight = 'bold' if psd[peak] > peaks_threshold[1] else 'normal'
+        peaks_above_effect_threshold = psd[peaks] > peaks_threshold[1]
+        for idx, (peak, above_effect_threshold) in enumerate(zip(peaks, peaks_above_effect_threshold)):
             ax.annotate(
                 f'{idx + 1}',
                 (freqs[peak], psd[peak]),
@@ -155,8 +167,8 @@ class ShaperPlotter(PlotterStrategy):
                 xytext=(8, 5),
                 ha='left',
                 fontsize=13,
-                color=fontcolor,
-                weight=fontweight,
+                color='red' if above_effect_threshold else 'black',
+                weight='bold' if above_effect_threshold else 'normal',
             )
 
         # Add threshold lines and regions
@@ -175,7 +187,7 @@ class ShaperPlotter(PlotterStrategy):
             sci_axes='y',
             legend=True,
         )
-        ax_2.legend(loc='upper right', prop=fontP)
+        ax_2.legend(handles=shapers_legend_handles, loc='upper right', prop=fontP)
 
     def _plot_spectrogram(self, ax, data: Dict[str, Any]) -> None:
         """Plot time-frequency spectrogram"""
@@ -210,34 +222,38 @@ class ShaperPlotter(PlotterStrategy):
     def _add_shaper_table(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add shaper parameters table"""
         columns = ['Type', 'Frequency', 'Vibrations', 'Smoothing', 'Max Accel']
+        shapers = data['shaper_table_data']['shapers']
         table_data = [
             [
-                shaper['type'].upper(),
-                f'{shaper["frequency"]:.1f} Hz',
-                f'{shaper["vibrations"] * 100:.1f} %',
-                f'{shaper["smoothing"]:.3f}',
-                f'{round(shaper["max_accel"] / 10) * 10:.0f}',
+                shaper_type.upper(),
+                f'{frequency:.1f} Hz',
+                f'{vibrations * 100:.1f} %',
+                f'{smoothing:.3f}',
+                f'{round(max_accel / 10) * 10:.0f}',
             ]
-            for shaper in data['shaper_table_data']['shapers']
+            for shaper_type, frequency, vibrations, smoothing, max_accel in zip(
+                shapers['type'], shapers['frequency'], shapers['vibrations'], shapers['smoothing'], shapers['max_accel']
+            )
         ]
 
-        table = plt.table(cellText=table_data, colLabels=columns, bbox=[1.100, 0.535, 0.830, 0.240], cellLoc='center')
+        table = fig.gca().table(
+            cellText=table_data, colLabels=columns, bbox=[1.100, 0.535, 0.830, 0.240], cellLoc='center'
+        )
         table.auto_set_font_size(False)
         table.set_fontsize(10)
         table.auto_set_column_width([0, 1, 2, 3, 4])
         table.set_zorder(100)
 
-        # Style the table
-        bold_font = matplotlib.font_manager.FontProperties(weight='bold')
-        for key, cell in table.get_celld().items():
-            row, col = key
-            cell.set_text_props(ha='center', va='center')
-            if col == 0:
-                cell.get_text().set_fontproperties(bold_font)
-                cell.get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_purple'])
-            if row == 0:
-                cell.get_text().set_fontproperties(bold_font)
-                cell.get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_orange'])
+        # Style the table: the cells text is already centered by the table itself, so only the
+        # first column and the header row need to be visited to make them bold and colored
+        bold_font = PlottingConstants.FONT_BOLD
+        cells = table.get_celld()
+        for row in range(1, len(table_data) + 1):
+            cells[row, 0].get_text().set_fontproperties(bold_font)
+            cells[row, 0].get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_purple'])
+        for col in range(len(columns)):
+            cells[0, col].get_text().set_fontproperties(bold_font)
+            cells[0, col].get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_orange'])
 
     def _add_recommendations(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add filter recommendations and damping ratio"""
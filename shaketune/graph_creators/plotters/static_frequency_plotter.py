@@ -6,11 +6,8 @@
 # File: static_frequency_plotter.py
 # Description: Plotter for static frequency graphs
 
-from datetime import datetime
 from typing import Any, Dict
 
-import matplotlib.pyplot as plt
-import numpy as np
 from matplotlib.figure import Figure
 
 from ..base_models import PlotterStrategy
@@ -25,7 +22,8 @@ class StaticFrequencyPlotter(PlotterStrategy):
         """Create static frequency graph"""
         data = result.get_plot_data()
 
-        fig, axes = plt.subplots(
+        fig = self.get_figure(figsize=(15, 7))
+        axes = fig.subplots(
             1,
             2,
             gridspec_kw={
@@ -37,7 +35,6 @@ class StaticFrequencyPlotter(PlotterStrategy):
                 'hspace': 0.166,
                 'wspace': 0.138,
             },
-            figsize=(15, 7),
         )
         ax_1, ax_2 = axes
 
@@ -57,9 +54,8 @@ class StaticFrequencyPlotter(PlotterStrategy):
     def _add_titles(self, fig: Figure, data: Dict[str, Any]) -> None:
         """Add title lines to the figure"""
         try:
-            filename_parts = data['measurements'][0]['name'].split('_')
-            dt = datetime.strptime(f'{filename_parts[2]} {filename_parts[3]}', '%Y%m%d %H%M%S')
-            title_line2 = dt.strftime('%x %X') + ' -- ' + filename_parts[1].upper() + ' axis'
+            date, axis = self.parse_measurement_name(data['measurements'][0]['name'])
+            title_line2 = date + ' -- ' + axis.upper() + ' axis'
         except Exception:
             title_line2 = data['measurements'][0]['name']
 
@@ -99,7 +95,11 @@ class StaticFrequencyPlotter(PlotterStrategy):
 
     def _plot_cumulative_energy(self, ax, data: Dict[str, Any]) -> None:
         """Plot cumulative energy"""
-        cumulative_energy = np.trapz(data['pdata'], data['t'], axis=0)
+        # Trapezoidal integration over the frequency bins, written as a single reduction pass since they
+        # are evenly spaced: dx * (sum(y) - (y[0] + y[-1]) / 2) is the same as np.trapz(y, dx=dx)
+        pdata = data['pdata']
+        dx = data['t'][1] - data['t'][0]
+        cumulative_energy = dx * (pdata.sum(axis=0) - 0.5 * (pdata[0] + pdata[-1]))
         ax.plot(cumulative_energy, data['bins'], color=PlottingConstants.KLIPPAIN_COLORS['orange'])
         ax.set_ylim([data['bins'][0], data['bins'][-1]])
 
@@ -7,17 +7,22 @@
 # Description: Plotter for machine vibrations analysis graphs
 
 from datetime import datetime
-from typing import Any, Dict
+from itertools import cycle
+from typing import Any, Dict, Optional, Tuple
 
 import matplotlib
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
 from ..base_models import PlotterStrategy
 from ..computation_results import VibrationsResult
 from ..plotting_utils import AxesConfiguration, PlottingConstants
 
+# Bound once at the module level as the palette is used all over this (big) plotter
+KLIPPAIN_COLORS = PlottingConstants.KLIPPAIN_COLORS
+
 
 class VibrationsPlotter(PlotterStrategy):
     """Plotter for machine vibrations analysis graphs"""
@@ -26,7 +31,7 @@ class VibrationsPlotter(PlotterStrategy):
         """Create machine vibrations analysis graph"""
         data = result.get_plot_data()
 
-        fig = plt.figure(figsize=(20, 11.5))
+        fig = self.get_figure(figsize=(20, 11.5))
         gs = fig.add_gridspec(
             2,
             3,
@@ -54,11 +59,26 @@ class VibrationsPlotter(PlotterStrategy):
         # Plot motor info if available
         self._plot_motor_info(fig, data)
 
+        # The angles in radians are needed by both polar plots, so they are only converted once
+        angles_radians = np.deg2rad(data['all_angles'])
+
+        # Both heatmaps are drawn from a float32 copy of the spectrogram (plenty for a colormap and it halves
+        # the bytes going through the matplotlib normalization and resampling) and share the same log color
+        # scale, so its limits (the same as LogNorm would find by itself: smallest positive value and maximum)
+        # are computed only once instead of once per heatmap. Without any positive value (flat signal from a
+        # disconnected accelerometer), the limits are left unset to let LogNorm handle it by itself as before
+        heatmap_data = data['spectrogram_data'].astype(np.float32)
+        positive_heatmap_data = heatmap_data[heatmap_data > 0]
+        if positive_heatmap_data.size > 0:
+            heatmap_vlims = (positive_heatmap_data.min(), heatmap_data.max())
+        else:
+            heatmap_vlims = (None, None)
+
         # Plot angle energy profile (Polar plot)
-        self._plot_angle_energy_profile(ax_1, data)
+        self._plot_angle_energy_profile(ax_1, data, angles_radians)
 
         # Plot polar vibrations heatmap
-        self._plot_polar_heatmap(ax_4, data)
+        self._plot_polar_heatmap(ax_4, data, angles_radians, heatmap_data, heatmap_vlims)
 
         # Plot global speed energy profile
         self._plot_speed_energy_profile(ax_2, data)
@@ -67,7 +87,7 @@ class VibrationsPlotter(PlotterStrategy):
         self._plot_angular_speed_profiles(ax_3, data)
 
         # Plot vibrations heatmap
-        self._plot_vibrations_heatmap(ax_5, data)
+        self._plot_vibrations_heatmap(ax_5, data, heatmap_data, heatmap_vlims)
 
         # Plot motor profiles
         self._plot_motor_profiles(ax_6, data)
@@ -91,7 +111,7 @@ class VibrationsPlotter(PlotterStrategy):
                 'y': 0.965,
                 'text': 'MACHINE VIBRATIONS ANALYSIS TOOL',
                 'fontsize': 20,
-                'color': PlottingConstants.KLIPPAIN_COLORS['purple'],
+                'color': KLIPPAIN_COLORS['purple'],
                 'weight': 'bold',
             },
             {'x': 0.060, 'y': 0.957, 'va': 'top', 'text': title_line2},
@@ -102,73 +122,54 @@ class VibrationsPlotter(PlotterStrategy):
         """Plot motor information if available"""
         motors = data.get('motors')
         if motors is not None and len(motors) == 2:
-            motor_details = [(motors[0], 'X motor'), (motors[1], 'Y motor')]
-            distance = 0.27 if motors[0].get_config('autotune_enabled') else 0.16
+            motor_details = [(motors[0].get_configs(), 'X motor'), (motors[1].get_configs(), 'Y motor')]
+            autotune_enabled = motor_details[0][0].get('autotune_enabled')
+            distance = 0.27 if autotune_enabled else 0.16
 
-            if motors[0].get_config('autotune_enabled'):
+            if autotune_enabled:
                 config_blocks = [
-                    f'| {lbl}: {mot.get_config("motor").upper()} on {mot.get_config("tmc").upper()} @ {mot.get_config("voltage"):0.1f}V {mot.get_config("run_current"):0.2f}A - {mot.get_config("microsteps")}usteps'
-                    for mot, lbl in motor_details
+                    f'| {lbl}: {cfg.get("motor").upper()} on {cfg.get("tmc").upper()} @ {cfg.get("voltage"):0.1f}V {cfg.get("run_current"):0.2f}A - {cfg.get("microsteps")}usteps'
+                    for cfg, lbl in motor_details
                 ]
                 config_blocks.append(
-                    f'| TMC Autotune enabled (PWM freq target: X={int(motors[0].get_config("pwm_freq_target") / 1000)}kHz / Y={int(motors[1].get_config("pwm_freq_target") / 1000)}kHz)'
+                    f'| TMC Autotune enabled (PWM freq target: X={int(motor_details[0][0].get("pwm_freq_target") / 1000)}kHz / Y={int(motor_details[1][0].get("pwm_freq_target") / 1000)}kHz)'
                 )
             else:
                 config_blocks = [
-                    f'| {lbl}: {mot.get_config("tmc").upper()} @ {mot.get_config("run_current"):0.2f}A - {mot.get_config("microsteps")}usteps'
-                    for mot, lbl in motor_details
+                    f'| {lbl}: {cfg.get("tmc").upper()} @ {cfg.get("run_current"):0.2f}A - {cfg.get("microsteps")}usteps'
+                    for cfg, lbl in motor_details
                 ]
                 config_blocks.append('| TMC Autotune not detected')
 
-            for idx, block in enumerate(config_blocks):
-                fig.text(
-                    0.41,
-                    0.990 - 0.015 * idx,
-                    block,
-                    ha='left',
-                    va='top',
-                    fontsize=10,
-                    color=PlottingConstants.KLIPPAIN_COLORS['dark_purple'],
-                )
-
-            tmc_registers = motors[0].get_registers()
-            idx = -1
-            for idx, (register, settings) in enumerate(tmc_registers.items()):
-                settings_str = ' '.join(f'{k}={v}' for k, v in settings.items())
-                tmc_block = f'| {register.upper()}: {settings_str}'
-                fig.text(
-                    0.41 + distance,
-                    0.990 - 0.015 * idx,
-                    tmc_block,
-                    ha='left',
-                    va='top',
-                    fontsize=10,
-                    color=PlottingConstants.KLIPPAIN_COLORS['dark_purple'],
-                )
-
+            # Each column is drawn as a single multiline text: a linespacing of 1.24 keeps the
+            # 0.015 figure fraction pitch of the 11.5 in high figure for these 10 pt lines
+            text_kwargs = {
+                'ha': 'left',
+                'va': 'top',
+                'fontsize': 10,
+                'linespacing': 1.24,
+                'color': KLIPPAIN_COLORS['dark_purple'],
+            }
+            fig.text(0.41, 0.990, '\n'.join(config_blocks), **text_kwargs)
+
+            tmc_blocks = [
+                f'| {register.upper()}: {" ".join(f"{k}={v}" for k, v in settings.items())}'
+                for register, settings in motors[0].get_registers().items()
+            ]
             if data.get('motors_config_differences') is not None:
-                differences_text = f'| Y motor diff: {data["motors_config_differences"]}'
-                fig.text(
-                    0.41 + distance,
-                    0.990 - 0.015 * (idx + 1),
-                    differences_text,
-                    ha='left',
-                    va='top',
-                    fontsize=10,
-                    color=PlottingConstants.KLIPPAIN_COLORS['dark_purple'],
-                )
+                tmc_blocks.append(f'| Y motor diff: {data["motors_config_differences"]}')
+            if tmc_blocks:
+                fig.text(0.41 + distance, 0.990, '\n'.join(tmc_blocks), **text_kwargs)
 
-    def _plot_angle_energy_profile(self, ax, data: Dict[str, Any]) -> None:
+    def _plot_angle_energy_profile(self, ax, data: Dict[str, Any], angles_radians: np.ndarray) -> None:
         """Plot angle energy profile on polar plot"""
-        all_angles = data['all_angles']
         all_angles_energy = data['all_angles_energy']
         good_angles = data.get('good_angles')
 
-        angles_radians = np.deg2rad(all_angles)
         ymax = all_angles_energy.max() * 1.05
 
-        ax.plot(angles_radians, all_angles_energy, color=PlottingConstants.KLIPPAIN_COLORS['purple'], zorder=5)
-        ax.fill(angles_radians, all_angles_energy, color=PlottingConstants.KLIPPAIN_COLORS['purple'], alpha=0.3)
+        ax.plot(angles_radians, all_angles_energy, color=KLIPPAIN_COLORS['purple'], zorder=5)
+        ax.fill(angles_radians, all_angles_energy, color=KLIPPAIN_COLORS['purple'], alpha=0.3)
         ax.set_xlim([0, np.deg2rad(360)])
         ax.set_ylim([0, ymax])
         ax.set_theta_zero_location('E')
@@ -180,35 +181,46 @@ class VibrationsPlotter(PlotterStrategy):
             f'Symmetry: {data["symmetry_factor"]:.1f}%',
             ha='center',
             va='center',
-            color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
+            color=KLIPPAIN_COLORS['red_pink'],
             fontsize=12,
             fontweight='bold',
             zorder=6,
         )
 
-        if good_angles is not None:
-            for start, end, _ in good_angles:
-                ax.axvline(
-                    angles_radians[start],
-                    all_angles_energy[start] / ymax,
-                    color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
-                    linestyle='dotted',
-                    linewidth=1.5,
-                )
-                ax.axvline(
-                    angles_radians[end],
-                    all_angles_energy[end] / ymax,
-                    color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
-                    linestyle='dotted',
-                    linewidth=1.5,
-                )
-                ax.fill_between(
-                    angles_radians[start:end],
-                    all_angles_energy[start:end],
-                    all_angles_energy.max() * 1.05,
+        if good_angles is not None and len(good_angles) > 0:
+            # The good zones boundaries are all drawn with a single LineCollection (in the same blended
+            # coordinates than axvline: theta in data and radius in axes coordinates) and the zones with
+            # a single PolyCollection instead of creating three artists per zone
+            boundaries = [idx for start, end, _ in good_angles for idx in (start, end)]
+            ax.add_collection(
+                LineCollection(
+                    [
+                        ((angles_radians[idx], all_angles_energy[idx] / ymax), (angles_radians[idx], 1))
+                        for idx in boundaries
+                    ],
+                    transform=ax.get_xaxis_transform(which='grid'),
+                    colors=KLIPPAIN_COLORS['red_pink'],
+                    linestyles='dotted',
+                    linewidths=1.5,
+                ),
+                autolim=False,
+            )
+            ax.add_collection(
+                PolyCollection(
+                    [
+                        np.concatenate(
+                            (
+                                np.column_stack((angles_radians[start:end], all_angles_energy[start:end])),
+                                np.column_stack((angles_radians[start:end][::-1], np.full(end - start, ymax))),
+                            )
+                        )
+                        for start, end, _ in good_angles
+                    ],
                     color='green',
                     alpha=0.2,
-                )
+                ),
+                autolim=False,
+            )
 
         AxesConfiguration.configure_axes(ax, title='Polar angle energy profile')
 
@@ -217,16 +229,27 @@ class VibrationsPlotter(PlotterStrategy):
         new_pos = [pos.x0 - 0.01, pos.y0 - 0.01, pos.width, pos.height]
         ax.set_position(new_pos)
 
-    def _plot_polar_heatmap(self, ax, data: Dict[str, Any]) -> None:
+    def _plot_polar_heatmap(
+        self,
+        ax,
+        data: Dict[str, Any],
+        angles_radians: np.ndarray,
+        heatmap_data: np.ndarray,
+        heatmap_vlims: Tuple[Optional[float], Optional[float]],
+    ) -> None:
         """Plot polar vibrations heatmap"""
         all_speeds = data['all_speeds']
-        all_angles = data['all_angles']
-        spectrogram_data = data['spectrogram_data']
 
-        angles_radians = np.deg2rad(all_angles)
-        radius, theta = np.meshgrid(all_speeds, angles_radians)
-
-        ax.pcolormesh(theta, radius, spectrogram_data, norm=matplotlib.colors.LogNorm(), cmap='inferno', shading='auto')
+        # The 1D coordinates are given directly to avoid materializing the full 2D meshgrids (the spectrogram
+        # rows are the angles, so it's transposed to get them along theta)
+        ax.pcolormesh(
+            angles_radians,
+            all_speeds,
+            heatmap_data.T,
+            norm=matplotlib.colors.LogNorm(*heatmap_vlims),
+            cmap='inferno',
+            shading='auto',
+        )
         ax.set_theta_zero_location('E')
         ax.set_theta_direction(1)
         ax.set_thetagrids([theta * 15 for theta in range(360 // 15)])
@@ -251,15 +274,13 @@ class VibrationsPlotter(PlotterStrategy):
         good_speeds = data.get('good_speeds')
         num_peaks = data['num_peaks']
 
-        ax.plot(
-            all_speeds, sp_min_energy, label='Minimum', color=PlottingConstants.KLIPPAIN_COLORS['dark_purple'], zorder=5
-        )
-        ax.plot(all_speeds, sp_max_energy, label='Maximum', color=PlottingConstants.KLIPPAIN_COLORS['purple'], zorder=5)
+        ax.plot(all_speeds, sp_min_energy, label='Minimum', color=KLIPPAIN_COLORS['dark_purple'], zorder=5)
+        ax.plot(all_speeds, sp_max_energy, label='Maximum', color=KLIPPAIN_COLORS['purple'], zorder=5)
         ax.plot(
             all_speeds,
             sp_variance_energy,
             label='Variance',
-            color=PlottingConstants.KLIPPAIN_COLORS['orange'],
+            color=KLIPPAIN_COLORS['orange'],
             zorder=5,
             linestyle='--',
         )
@@ -273,10 +294,13 @@ class VibrationsPlotter(PlotterStrategy):
             all_speeds,
             vibration_metric,
             label=f'Vibration metric ({num_peaks} bad peaks)',
-            color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
+            color=KLIPPAIN_COLORS['red_pink'],
             zorder=5,
         )
-        ax_2.set_ylim([-(vibration_metric.max() * 0.025), vibration_metric.max() * 1.07])
+        # The lower limit is shared with the good speeds zones that are filled down to it
+        vibration_metric_max = vibration_metric.max()
+        vibration_metric_low = -(vibration_metric_max * 0.025)
+        ax_2.set_ylim([vibration_metric_low, vibration_metric_max * 1.07])
 
         if vibration_peaks is not None and len(vibration_peaks) > 0:
             ax_2.plot(
@@ -296,7 +320,7 @@ class VibrationsPlotter(PlotterStrategy):
                     fontweight='bold',
                     ha='left',
                     fontsize=13,
-                    color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
+                    color=KLIPPAIN_COLORS['red_pink'],
                     zorder=10,
                 )
 
@@ -304,7 +328,7 @@ class VibrationsPlotter(PlotterStrategy):
             for idx, (start, end, _) in enumerate(good_speeds):
                 ax_2.fill_between(
                     all_speeds[start:end],
-                    -(vibration_metric.max() * 0.025),
+                    vibration_metric_low,
                     vibration_metric[start:end],
                     color='green',
                     alpha=0.2,
@@ -330,36 +354,36 @@ class VibrationsPlotter(PlotterStrategy):
             135: ('B (135 deg)' if kinematics in {'corexy', 'limited_corexy'} else '135 deg', 'dark_orange', 5),
         }
 
-        for angle, (label, color, zorder) in angle_settings.items():
-            idx = np.searchsorted(all_angles, angle, side='left')
+        # Gather the spectrogram rows of the plotted angles only once as they are also used for the ylim
+        angles_rows = spectrogram_data[np.searchsorted(all_angles, list(angle_settings), side='left')]
+        for angle_row, (label, color, zorder) in zip(angles_rows, angle_settings.values()):
             ax.plot(
                 all_speeds,
-                spectrogram_data[idx],
+                angle_row,
                 label=label,
-                color=PlottingConstants.KLIPPAIN_COLORS[color],
+                color=KLIPPAIN_COLORS[color],
                 zorder=zorder,
             )
 
         ax.set_xlim([all_speeds.min(), all_speeds.max()])
-        max_value = max(
-            spectrogram_data[np.searchsorted(all_angles, angle, side='left')].max() for angle in angle_settings
-        )
+        max_value = angles_rows.max()
         ax.set_ylim([0, max_value * 1.1])
         fontP = AxesConfiguration.configure_axes(
             ax, xlabel='Speed (mm/s)', ylabel='Energy', title='Angular speed energy profiles', legend=False
         )
         ax.legend(loc='upper right', prop=fontP)
 
-    def _plot_vibrations_heatmap(self, ax, data: Dict[str, Any]) -> None:
+    def _plot_vibrations_heatmap(
+        self, ax, data: Dict[str, Any], heatmap_data: np.ndarray, heatmap_vlims: Tuple[Optional[float], Optional[float]]
+    ) -> None:
         """Plot vibrations heatmap"""
         all_speeds = data['all_speeds']
         all_angles = data['all_angles']
-        spectrogram_data = data['spectrogram_data']
         vibration_peaks = data.get('vibration_peaks')
 
         ax.imshow(
-            spectrogram_data,
-            norm=matplotlib.colors.LogNorm(),
+            heatmap_data,
+            norm=matplotlib.colors.LogNorm(*heatmap_vlims),
             cmap='inferno',
             aspect='auto',
             extent=[all_speeds[0], all_speeds[-1], all_angles[0], all_angles[-1]],
@@ -367,13 +391,15 @@ class VibrationsPlotter(PlotterStrategy):
             interpolation='antialiased',
         )
 
-        # Add vibrations peaks lines in the spectrogram
+        # Add vibrations peaks lines in the spectrogram (all drawn as a single LineCollection spanning the
+        # full axes height like axvline would do)
         if vibration_peaks is not None and len(vibration_peaks) > 0:
-            for idx, peak in enumerate(vibration_peaks):
-                ax.axvline(all_speeds[peak], color='cyan', linewidth=0.75)
+            peaks_speeds = all_speeds[vibration_peaks]
+            ax.vlines(peaks_speeds, 0, 1, transform=ax.get_xaxis_transform(), colors='cyan', linewidths=0.75)
+            for idx, peak_speed in enumerate(peaks_speeds):
                 ax.annotate(
-                    f'Peak {idx + 1} ({all_speeds[peak]:.1f} mm/s)',
-                    (all_speeds[peak], all_angles[-1] * 0.9),
+                    f'Peak {idx + 1} ({peak_speed:.1f} mm/s)',
+                    (peak_speed, all_angles[-1] * 0.9),
                     textcoords='data',
                     color='cyan',
                     rotation=90,
@@ -405,21 +431,32 @@ class VibrationsPlotter(PlotterStrategy):
             135: ('B (135 deg)' if kinematics in {'corexy', 'limited_corexy'} else '135 deg', 'dark_orange', 5),
         }
 
-        ax.plot(
+        combined_line = ax.plot(
             target_freqs,
             global_motor_profile,
             label='Combined',
-            color=PlottingConstants.KLIPPAIN_COLORS['purple'],
+            color=KLIPPAIN_COLORS['purple'],
             zorder=5,
-        )
-        max_value = global_motor_profile.max()
+        )[0]
 
-        for angle in main_angles:
-            profile_max = motor_profiles[angle].max()
-            if profile_max > max_value:
-                max_value = profile_max
-            label = f'{angle_settings.get(angle, (f"{angle} deg",))[0]}'
-            ax.plot(target_freqs, motor_profiles[angle], linestyle='--', label=label, zorder=2)
+        # The per angle profiles are all drawn with a single LineCollection and some proxy artists
+        # are created to still get one legend entry per angle
+        profiles_colors = [
+            color for color, _ in zip(cycle(matplotlib.rcParams['axes.prop_cycle'].by_key()['color']), main_angles)
+        ]
+        ax.add_collection(
+            LineCollection(
+                [np.column_stack((target_freqs, motor_profiles[angle])) for angle in main_angles],
+                colors=profiles_colors,
+                linestyles='--',
+                zorder=2,
+            )
+        )
+        profiles_legend_handles = [
+            Line2D([], [], color=color, linestyle='--', label=angle_settings.get(angle, (f'{angle} deg',))[0])
+            for angle, color in zip(main_angles, profiles_colors)
+        ]
+        max_value = max(global_motor_profile.max(), max(motor_profiles[angle].max() for angle in main_angles))
 
         ax.set_xlim([0, max_freq])
         ax.set_ylim([0, max_value * 1.1])
@@ -433,7 +470,7 @@ class VibrationsPlotter(PlotterStrategy):
             xytext=(15, 5),
             ha='right',
             fontsize=14,
-            color=PlottingConstants.KLIPPAIN_COLORS['red_pink'],
+            color=KLIPPAIN_COLORS['red_pink'],
             weight='bold',
         )
 
@@ -446,6 +483,7 @@ class VibrationsPlotter(PlotterStrategy):
             ax_2.plot([], [], ' ', label='No damping ratio computed')
 
         fontP = AxesConfiguration.configure_axes(
-            ax, xlabel='Frequency (Hz)', ylabel='Energy', title='Motor frequency profile', sci_axes='y', legend=True
+            ax, xlabel='Frequency (Hz)', ylabel='Energy', title='Motor frequency profile', sci_axes='y'
         )
+        ax.legend(handles=[combined_line, *profiles_legend_handles], loc='upper left', prop=fontP)
         ax_2.legend(loc='upper right', prop=fontP)
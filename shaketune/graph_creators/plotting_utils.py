@@ -25,6 +25,10 @@ class PlottingConstants:
         'red_pink': '#F2055C',
     }
 
+    # Shared font properties (they are copied into each Text artist using them)
+    FONT_XSMALL = matplotlib.font_manager.FontProperties(size='x-small')
+    FONT_BOLD = matplotlib.font_manager.FontProperties(weight='bold')
+
     # Spectrogram settings
     SPECTROGRAM_LOW_PERCENTILE_FILTER = 5
 
@@ -54,8 +58,7 @@ class AxesConfiguration:
         ax.set_xlabel(xlabel)
         ax.set_ylabel(ylabel)
 
-        fontP = matplotlib.font_manager.FontProperties()
-        fontP.set_size('x-small')
+        fontP = PlottingConstants.FONT_XSMALL
 
         if zlabel != '':
             ax.set_zlabel(zlabel)
@@ -94,13 +97,20 @@ class SpectrogramHelper:
     ) -> None:
         """Plot a time-frequency spectrogram"""
         vmin_value = np.percentile(pdata, percentile_filter)
+        vmax_value = pdata.max()
+
+        # Only the frequencies up to max_freq are displayed, so the image is cropped to them before
+        # being normalized and resampled by matplotlib. The extent is cropped accordingly (keeping the
+        # same size for each image pixel) as well as the norm that is still set on the full data range
+        pixel_width = (t[-1] - t[0]) / len(t)
+        cutoff = min(int(np.searchsorted(t, max_freq, side='right')) + 1, len(t))
 
         ax.imshow(
-            pdata.T,
-            norm=matplotlib.colors.LogNorm(vmin=vmin_value),
+            pdata[:cutoff].T,
+            norm=matplotlib.colors.LogNorm(vmin=vmin_value, vmax=vmax_value),
             cmap='inferno',
             aspect='auto',
-            extent=[t[0], t[-1], bins[0], bins[-1]],
+            extent=[t[0], t[0] + cutoff * pixel_width, bins[0], bins[-1]],
             origin='lower',
             interpolation='antialiased',
         )
@@ -133,18 +143,18 @@ class TableHelper:
 
         table.set_zorder(100)
 
-        # Style the table
-        bold_font = matplotlib.font_manager.FontProperties(weight='bold')
-        for key, cell in table.get_celld().items():
-            row, col = key
-            cell.set_text_props(ha='center', va='center')
-
-            if row == 0:  # Header row
-                cell.get_text().set_fontproperties(bold_font)
-                cell.get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_orange'])
-            elif col == 0:  # First column
-                cell.get_text().set_fontproperties(bold_font)
-                cell.get_text().set_color(PlottingConstants.KLIPPAIN_COLORS['dark_purple'])
+        # Style the table: the cells text is already centered by the table itself, so only the
+        # first column and the header row need to be visited to make them bold and colored
+        bold_font = PlottingConstants.FONT_BOLD
+        cells = table.get_celld()
+        for row in range(1, len(data) + 1):
+            cell_text = cells[row, 0].get_text()
+            cell_text.set_fontproperties(bold_font)
+            cell_text.set_color(PlottingConstants.KLIPPAIN_COLORS['dark_purple'])
+        for col in range(len(columns)):
+            cell_text = cells[0, col].get_text()
+            cell_text.set_fontproperties(bold_font)
+            cell_text.set_color(PlottingConstants.KLIPPAIN_COLORS['dark_orange'])
 
         return table
 
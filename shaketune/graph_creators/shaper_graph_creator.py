@@ -19,6 +19,8 @@ from .plotters.shaper_plotter import ShaperPlotter
 class ShaperGraphCreator(GraphCreator):
     """Input shaper graph creator using composition-based architecture"""
 
+    __slots__ = ('_scv', '_max_smoothing', '_test_params', '_max_scale')
+
     def __init__(self, config: ShakeTuneConfig):
         super().__init__(config, ShaperComputation, ShaperPlotter)
         self._max_smoothing: Optional[float] = None
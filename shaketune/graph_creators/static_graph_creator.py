@@ -19,6 +19,8 @@ from .plotters.static_frequency_plotter import StaticFrequencyPlotter
 class StaticGraphCreator(GraphCreator):
     """Static frequency graph creator using composition-based architecture"""
 
+    __slots__ = ('_freq', '_duration', '_accel_per_hz')
+
     def __init__(self, config: ShakeTuneConfig):
         super().__init__(config, StaticFrequencyComputation, StaticFrequencyPlotter)
         self._freq: Optional[float] = None
@@ -20,6 +20,8 @@ from .plotters.vibrations_plotter import VibrationsPlotter
 class VibrationsGraphCreator(GraphCreator):
     """Machine vibrations graph creator using composition-based architecture"""
 
+    __slots__ = ('_kinematics', '_accel', '_motors')
+
     def __init__(self, config: ShakeTuneConfig):
         super().__init__(config, VibrationsComputation, VibrationsPlotter)
         self._kinematics: Optional[str] = None
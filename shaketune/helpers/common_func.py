@@ -11,11 +11,15 @@
 import math
 import os
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
 
 import numpy as np
-from scipy.signal import spectrogram
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.fft import set_backend, set_workers
+from scipy.signal import find_peaks, spectrogram
 
 # Constant used to define the standard axis direction and names
 AXIS_CONFIG = [
@@ -57,26 +61,86 @@ def get_git_version():
         return None
 
 
-# This is Klipper's spectrogram generation function adapted to use Scipy
-def compute_spectrogram(data):
+# pyFFTW is an optional dependency: when it's available, it's used as the scipy.fft backend for the STFTs
+# since it's faster than the default pocketfft implementation and can cache the FFT plans between the
+# repeated calls. It's only imported and set up on the first use (in the graph computations) and then only
+# installed around these calls, to not alter scipy.fft for the Klipper host process that imports this module
+@lru_cache(maxsize=1)
+def _get_pyfftw_backend():
+    try:
+        import pyfftw.interfaces.scipy_fft
+    except ImportError:
+        return None
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    return pyfftw.interfaces.scipy_fft
+
+
+# Spread the FFTs on all the CPU cores and use pyFFTW for them when it's installed
+@contextmanager
+def _fft_context():
+    backend = _get_pyfftw_backend()
+    with set_workers(-1):
+        if backend is None:
+            yield
+        else:
+            with set_backend(backend):
+                yield
+
+
+def _stft_parameters(data):
     N = data.shape[0]
     Fs = N / (data[-1, 0] - data[0, 0])
     # Round up to a power of 2 for faster FFT
     M = 1 << int(0.5 * Fs - 1).bit_length()
-    window = np.kaiser(M, 6.0)
+    return N, Fs, M, np.kaiser(M, 6.0)
 
-    def _specgram(x):
-        return spectrogram(
-            x, fs=Fs, window=window, nperseg=M, noverlap=M // 2, detrend='constant', scaling='density', mode='psd'
-        )
 
-    d = {'x': data[:, 1], 'y': data[:, 2], 'z': data[:, 3]}
-    f, t, pdata = _specgram(d['x'])
-    for axis in 'yz':
-        pdata += _specgram(d[axis])[2]
+def _specgram(x, Fs, M, window):
+    return spectrogram(
+        x, fs=Fs, window=window, nperseg=M, noverlap=M // 2, detrend='constant', scaling='density', mode='psd'
+    )
+
+
+# This is Klipper's spectrogram generation function adapted to use Scipy
+def compute_spectrogram(data):
+    _, Fs, M, window = _stft_parameters(data)
+
+    # Only the accelerations are converted to float32 (plenty enough for a spectrogram) to halve the memory
+    # bandwidth, as the timestamps used for Fs need float64
+    d = {axis: data[:, i].astype(np.float32) for i, axis in enumerate('xyz', start=1)}
+    with _fft_context():
+        f, t, pdata = _specgram(d['x'], Fs, M, window)
+        for axis in 'yz':
+            pdata += _specgram(d[axis], Fs, M, window)[2]
     return pdata, t, f
 
 
+# Compute both the PSD and the spectrogram of the accelerations from a single STFT pass. Klipper's
+# shaper_calibrate uses Welch's method with exactly the same windowing parameters as the spectrogram,
+# so its PSD is simply the time average of each axis spectrogram and doesn't need its own FFTs. The
+# PSD is returned in the CalibrationData order (freq_bins, psd_sum, psd_x, psd_y, psd_z) and the
+# spectrogram in the compute_spectrogram order (pdata, t, f)
+def compute_psd_and_spectrogram(data):
+    N, Fs, M, window = _stft_parameters(data)
+    if N <= M:
+        raise ValueError('Not enough samples in the recording to compute the PSD!')
+
+    # The accelerations are kept in float64 here since the PSD is used for the shapers computations
+    psds = []
+    with _fft_context():
+        for i in range(1, 4):
+            f, t, sxx = _specgram(data[:, i], Fs, M, window)
+            psds.append(sxx.mean(axis=-1))
+            if i == 1:
+                pdata = sxx
+            else:
+                pdata += sxx
+    psd_x, psd_y, psd_z = psds
+    return (f, psd_x + psd_y + psd_z, psd_x, psd_y, psd_z), (pdata, t, f)
+
+
 # Compute natural resonant frequency and damping ratio by using the half power bandwidth method with interpolated frequencies
 def compute_mechanical_parameters(psd, freqs, min_freq=None):
     max_under_min_freq = False
@@ -130,7 +194,7 @@ def compute_mechanical_parameters(psd, freqs, min_freq=None):
     return fr, zeta, max_power_index, max_under_min_freq
 
 
-# This find all the peaks in a curve by looking at when the derivative term goes from positive to negative
+# This find all the peaks in a curve by looking for the local maxima of a smoothed version of it (using scipy find_peaks)
 # Then only the peaks found above a threshold are kept to avoid capturing peaks in the low amplitude noise of a signal
 def detect_peaks(data, indices, detection_threshold, relative_height_threshold=None, window_size=5, vicinity=3):
     # Smooth the curve using a moving average to avoid catching peaks everywhere in noisy signals
@@ -140,31 +204,29 @@ def detect_peaks(data, indices, detection_threshold, relative_height_threshold=N
     smoothed_data = np.concatenate((mean_pad, smoothed_data))
 
     # Find peaks on the smoothed curve
-    smoothed_peaks = (
-        np.where((smoothed_data[:-2] < smoothed_data[1:-1]) & (smoothed_data[1:-1] > smoothed_data[2:]))[0] + 1
-    )
+    smoothed_peaks, _ = find_peaks(smoothed_data)
     smoothed_peaks = smoothed_peaks[smoothed_data[smoothed_peaks] > detection_threshold]
 
+    # Windows of +/- vicinity points around each peak are extracted all at once from padded views of the
+    # curves. The padding values are chosen so that they are never selected by the min/max searches
+    window_length = 2 * vicinity + 1
+
     # Additional validation for peaks based on relative height
     valid_peaks = smoothed_peaks
     if relative_height_threshold is not None:
-        valid_peaks = []
-        for peak in smoothed_peaks:
-            peak_height = smoothed_data[peak] - np.min(
-                smoothed_data[max(0, peak - vicinity) : min(len(smoothed_data), peak + vicinity + 1)]
-            )
-            if peak_height > relative_height_threshold * smoothed_data[peak]:
-                valid_peaks.append(peak)
+        padded_smoothed = np.pad(smoothed_data, vicinity, mode='constant', constant_values=np.inf)
+        smoothed_windows = sliding_window_view(padded_smoothed, window_length)[smoothed_peaks]
+        peak_heights = smoothed_data[smoothed_peaks] - np.min(smoothed_windows, axis=1)
+        valid_peaks = smoothed_peaks[peak_heights > relative_height_threshold * smoothed_data[smoothed_peaks]]
 
     # Refine peak positions on the original curve
-    refined_peaks = []
-    for peak in valid_peaks:
-        local_max = peak + np.argmax(data[max(0, peak - vicinity) : min(len(data), peak + vicinity + 1)]) - vicinity
-        refined_peaks.append(local_max)
+    padded_data = np.pad(data, vicinity, mode='constant', constant_values=-np.inf)
+    data_windows = sliding_window_view(padded_data, window_length)[valid_peaks]
+    refined_peaks = valid_peaks + np.argmax(data_windows, axis=1) - vicinity
 
     num_peaks = len(refined_peaks)
 
-    return num_peaks, np.array(refined_peaks), indices[refined_peaks]
+    return num_peaks, refined_peaks, indices[refined_peaks]
 
 
 # The goal is to find zone outside of peaks (flat low energy zones) in a signal
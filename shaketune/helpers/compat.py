@@ -12,6 +12,10 @@ ResTesterConfig = namedtuple(
     'ResTesterConfig', ['default_min_freq', 'default_max_freq', 'default_accel_per_hz', 'test_points']
 )
 
+# Resonance tester parameters used for the static frequency tests, where there is no resonance tester
+# (min_freq, max_freq, accel_per_hz, hz_per_sec, sweeping_period, sweeping_accel)
+STATIC_FREQ_FALLBACK_PARAMS = (50, 200, 75, 1, 0.0, None)
+
 
 class KlipperCompatibility:
     """
@@ -20,59 +24,77 @@ class KlipperCompatibility:
     capabilities to provide appropriate fallbacks and method calls.
     """
 
+    __slots__ = (
+        'printer',
+        'toolhead',
+        'res_tester',
+        '_set_max_velocities',
+        '_cmd_m204',
+        '_limit_junction',
+        '_legacy_test',
+        '_set_accel',
+    )
+
     def __init__(self, config, res_tester=None):
         """Initialize with Klipper configuration and cache capability detection."""
         self.printer = config.get_printer()
         self.toolhead = self.printer.lookup_object('toolhead')
         self.res_tester = res_tester if res_tester is not None else self.printer.lookup_object('resonance_tester')
 
-        # Cache capability detection results to avoid repeated hasattr calls
-        self._capabilities = {}
-
-    def _check_capability(self, capability_name, obj, attr_name):
-        """Check and cache a specific capability."""
-        if capability_name not in self._capabilities:
-            self._capabilities[capability_name] = hasattr(obj, attr_name)
-        return self._capabilities[capability_name]
+        # The Klipper objects are long-lived and their API doesn't change at runtime, so each capability
+        # is resolved only once here into the bound method (or attribute) to use, or None if not available
+        self._set_max_velocities = getattr(self.toolhead, 'set_max_velocities', None)
+        self._cmd_m204 = getattr(self.toolhead, 'cmd_M204', None)
+        self._limit_junction = getattr(self.toolhead, 'limit_next_junction_speed', None)
+        self._legacy_test = getattr(self.res_tester, 'test', None)
+
+        # The best method to set the toolhead acceleration is then also chosen once for all
+        if self._set_max_velocities is not None:
+            self._set_accel = self._set_accel_with_max_velocities
+        elif self._cmd_m204 is not None:
+            self._set_accel = self._set_accel_with_m204
+        else:
+            self._set_accel = self._set_accel_unsupported
 
     # Toolhead acceleration setting capabilities
     def can_set_max_velocities(self):
         """Check if toolhead supports the set_max_velocities method (newer Klipper)."""
-        return self._check_capability('set_max_velocities', self.toolhead, 'set_max_velocities')
+        return self._set_max_velocities is not None
 
     def can_use_cmd_m204(self):
         """Check if toolhead supports the cmd_M204 method (older Klipper)."""
-        return self._check_capability('cmd_m204', self.toolhead, 'cmd_M204')
+        return self._cmd_m204 is not None
 
     def can_limit_junction_speed(self):
         """Check if toolhead supports junction speed limiting (newer Klipper)."""
-        return self._check_capability('limit_junction_speed', self.toolhead, 'limit_next_junction_speed')
+        return self._limit_junction is not None
 
     # Resonance tester API capabilities
     def has_legacy_res_tester_api(self):
         """Check if resonance tester uses the legacy API with .test attribute."""
-        if self.res_tester is None:
-            return False
-        return self._check_capability('legacy_res_tester', self.res_tester, 'test')
+        return self._legacy_test is not None
 
     def has_modern_res_tester_api(self):
         """Check if resonance tester uses the modern API with generator."""
-        if self.res_tester is None:
-            return False
-        return not self.has_legacy_res_tester_api()
+        return self.res_tester is not None and self._legacy_test is None
 
     # Unified methods for common operations
     def set_toolhead_acceleration(self, gcode, accel):
         """
         Set toolhead acceleration using the best available method.
-        Tries methods in order: set_max_velocities -> cmd_M204 -> gcode fallback.
+        The method is chosen at init in order: set_max_velocities -> cmd_M204 -> error.
         """
-        if self.can_set_max_velocities():
-            self.toolhead.set_max_velocities(None, abs(accel), None, None)
-        elif self.can_use_cmd_m204():
-            self.toolhead.cmd_M204(gcode.create_gcode_command('M204', 'M204', {'S': abs(accel)}))
-        else:
-            raise NotImplementedError('No method found to set toolhead acceleration. Klipper API likely changed.')
+        self._set_accel(gcode, accel)
+
+    def _set_accel_with_max_velocities(self, gcode, accel):
+        self._set_max_velocities(None, abs(accel), None, None)
+
+    def _set_accel_with_m204(self, gcode, accel):
+        self._cmd_m204(gcode.create_gcode_command('M204', 'M204', {'S': abs(accel)}))
+
+    @staticmethod
+    def _set_accel_unsupported(gcode, accel):
+        raise NotImplementedError('No method found to set toolhead acceleration. Klipper API likely changed.')
 
     def get_res_tester_config(self) -> ResTesterConfig:
         """
@@ -81,15 +103,17 @@ class KlipperCompatibility:
         """
         if self.has_legacy_res_tester_api():
             # Legacy API (before Dec 6, 2024: https://github.com/Klipper3d/klipper/commit/16b4b6b302ac3ffcd55006cd76265aad4e26ecc8)
-            default_min_freq = self.res_tester.test.min_freq
-            default_max_freq = self.res_tester.test.max_freq
-            default_accel_per_hz = self.res_tester.test.accel_per_hz
-            test_points = self.res_tester.test.get_start_test_points()
+            test = self._legacy_test
+            default_min_freq = test.min_freq
+            default_max_freq = test.max_freq
+            default_accel_per_hz = test.accel_per_hz
+            test_points = test.get_start_test_points()
         else:
             # Modern API (after Dec 6, 2024) with the sweeping test
-            default_min_freq = self.res_tester.generator.vibration_generator.min_freq
-            default_max_freq = self.res_tester.generator.vibration_generator.max_freq
-            default_accel_per_hz = self.res_tester.generator.vibration_generator.accel_per_hz
+            vibration_generator = self.res_tester.generator.vibration_generator
+            default_min_freq = vibration_generator.min_freq
+            default_max_freq = vibration_generator.max_freq
+            default_accel_per_hz = vibration_generator.accel_per_hz
             test_points = self.res_tester.probe_points
 
         return ResTesterConfig(default_min_freq, default_max_freq, default_accel_per_hz, test_points)
@@ -100,24 +124,26 @@ class KlipperCompatibility:
         Returns tuple compatible with existing get_parameters() method.
         """
         if self.res_tester is None:
-            # Fallback for static frequency tests where res_tester is None
-            return (50, 200, 75, 1, 0.0, None)
+            return STATIC_FREQ_FALLBACK_PARAMS
 
         if self.has_legacy_res_tester_api():
+            test = self._legacy_test
             return (
-                self.res_tester.test.min_freq,
-                self.res_tester.test.max_freq,
-                self.res_tester.test.accel_per_hz,
-                self.res_tester.test.hz_per_sec,
+                test.min_freq,
+                test.max_freq,
+                test.accel_per_hz,
+                test.hz_per_sec,
                 0.0,  # sweeping_period=0 to force the old style pulse-only test
                 None,  # sweeping_accel unused in old style pulse-only test
             )
         else:
+            generator = self.res_tester.generator
+            vibration_generator = generator.vibration_generator
             return (
-                self.res_tester.generator.vibration_generator.min_freq,
-                self.res_tester.generator.vibration_generator.max_freq,
-                self.res_tester.generator.vibration_generator.accel_per_hz,
-                self.res_tester.generator.vibration_generator.hz_per_sec,
-                self.res_tester.generator.sweeping_period,
-                self.res_tester.generator.sweeping_accel,
+                vibration_generator.min_freq,
+                vibration_generator.max_freq,
+                vibration_generator.accel_per_hz,
+                vibration_generator.hz_per_sec,
+                generator.sweeping_period,
+                generator.sweeping_accel,
             )
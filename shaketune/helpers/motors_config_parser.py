@@ -64,6 +64,9 @@ class Motor:
     def get_config(self, field: str) -> Optional[Any]:
         return self._config.get(field)
 
+    def get_configs(self) -> Dict[str, Any]:
+        return self._config
+
     def __str__(self):
         return f'Stepper: {self.name}\nKlipper config: {self._config}\nTMC Registers: {self._registers}'
 
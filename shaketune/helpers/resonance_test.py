@@ -225,6 +225,11 @@ class ResonanceTestManager:
             input_shaper.disable_shaping()
             ConsoleOutput.print('Disabled [input_shaper] for resonance testing')
 
+        # The acceleration setter and the junction speed capability are fixed for the whole sequence,
+        # so they are resolved once here instead of at every segment
+        set_toolhead_acceleration = self.compat.set_toolhead_acceleration
+        limit_junction_speed = self.compat.can_limit_junction_speed()
+
         normalized_direction = self._normalize_direction(axis_direction)
         last_v = 0.0
         last_t = 0.0
@@ -233,7 +238,7 @@ class ResonanceTestManager:
 
         for next_t, accel, freq in test_seq:
             t_seg = next_t - last_t
-            self.compat.set_toolhead_acceleration(self.gcode, accel)
+            set_toolhead_acceleration(gcode, accel)
             v = last_v + accel * t_seg
             abs_v = abs(v)
             if abs_v < 1e-6:
@@ -246,7 +251,7 @@ class ResonanceTestManager:
             dX, dY, dZ = self._project_distance(d, normalized_direction)
             nX, nY, nZ = X + dX, Y + dY, Z + dZ
 
-            if self.compat.can_limit_junction_speed():
+            if limit_junction_speed:
                 toolhead.limit_next_junction_speed(abs_last_v)
 
             # If direction changed sign, must pass through zero velocity
@@ -272,7 +277,7 @@ class ResonanceTestManager:
         if last_v != 0.0:
             d_decel = -0.5 * last_v2 / old_max_accel if old_max_accel != 0 else 0
             ddX, ddY, ddZ = self._project_distance(d_decel, normalized_direction)
-            self.compat.set_toolhead_acceleration(self.gcode, old_max_accel)
+            set_toolhead_acceleration(gcode, old_max_accel)
             toolhead.move([X + ddX, Y + ddY, Z + ddZ, E], abs(last_v))
 
         # Restore the previous acceleration values
@@ -8,6 +8,7 @@
 #              and file paths related to Shake&Tune operations.
 
 
+from functools import lru_cache
 from pathlib import Path
 
 from .helpers.console_output import ConsoleOutput
@@ -57,6 +58,7 @@ class ShakeTuneConfig:
         return subfolders
 
     @staticmethod
+    @lru_cache(maxsize=1)  # The version can't change during the process lifetime
     def get_git_version() -> str:
         try:
             from git import GitCommandError, Repo